@@ -1,6 +1,7 @@
 """
 全局配置文件
 """
+import os
 
 # 视频处理相关配置
 VIDEO_SETTINGS = {
@@ -10,6 +11,10 @@ VIDEO_SETTINGS = {
     'BLUR_SIGMA': 30,            # 高斯模糊程度
     'SIDE_VIDEO_SCALE': 0.3,     # 右侧视频尺寸（占原视频的30%）
     'SIDE_VIDEO_X': 470,         # 右侧视频的x坐标
+    'FUSED_PIPELINE': False,     # 单次ffmpeg融合流水线（不写中间文件，不含字幕烧录）
+    'FFMPEG_THREADS': 0,         # ffmpeg线程数，0=自动使用全部核心；多进程并行时可调小
+    'X264_PRESET': 'ultrafast',  # 中间片段的x264编码预设
+    'HW_ACCEL': 'auto',          # 最终编码硬件加速：'auto'=自动探测NVENC，None=纯CPU
 }
 
 # 文字效果相关配置
@@ -38,5 +43,8 @@ PATH_SETTINGS = {
     'PIP1_FOLDER': "assets/pip1_videos",  # 主视频目录
     'PIP2_FOLDER': "assets/pip2_videos",  # 侧视频目录
     'OUTPUTS_FOLDER': "outputs",          # 输出目录
-    'TEMP_DIR': "temp"                    # 临时文件夹
+    # 临时文件夹：Linux上优先用tmpfs（内存盘），数百MB的中间文件
+    # 不落磁盘；无/dev/shm的平台回退到本地temp目录
+    'TEMP_DIR': ("/dev/shm/video_synthesis"
+                 if os.path.isdir("/dev/shm") else "temp")
 } 
\ No newline at end of file
@@ -168,6 +168,8 @@ class SubtitleAnalyzer:
         }
         # 添加内容管理器
         self.content_manager = ExtractedContentManager()
+        # 最近一次解析的字幕缓存 (文件路径, 解析结果)，避免verify_timestamp重复解析
+        self._srt_cache = (None, None)
 
     def parse_timestamp(self, timestamp: str) -> Tuple[int, int, int, int]:
         """
@@ -470,9 +472,10 @@ class SubtitleAnalyzer:
             # 清空已提取内容记录
             self.content_manager.clear()
             
-            # 1. 读取字幕文件
+            # 1. 读取字幕文件（缓存解析结果供后续verify_timestamp复用）
             subtitles = self.read_srt_file(file_path)
-            
+            self._srt_cache = (file_path, subtitles)
+
             # 2. 按时间段分割字幕
             segmented_subtitles = self.process_subtitles_by_segment(subtitles)
             
@@ -501,52 +504,49 @@ class SubtitleAnalyzer:
     def read_srt_file(self, file_path: str) -> List[Dict]:
         """
         读取.srt字幕文件，保留时间戳信息
-        
+
+        采用逐行流式解析，不把整个文件读入内存，
+        超大字幕文件（长视频）也能以固定内存开销处理。
+
         Args:
             file_path (str): 字幕文件路径
-            
+
         Returns:
             List[Dict]: 字幕内容列表，每项包含文本和时间戳
         """
         subtitles = []
         current_subtitle = {}
-        
+
         with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # 序号行
-            if line.isdigit():
-                if current_subtitle:
-                    subtitles.append(current_subtitle)
-                current_subtitle = {"index": int(line)}
-                i += 1
-                continue
-                
-            # 时间戳行
-            if '-->' in line:
-                timestamps = line.split(' --> ')
-                current_subtitle["start_time"] = timestamps[0].strip()
-                current_subtitle["end_time"] = timestamps[1].strip()
-                current_subtitle["text"] = ""
-                i += 1
-                continue
-                
-            # 文本行
-            if line and current_subtitle:
-                if current_subtitle["text"]:
-                    current_subtitle["text"] += " " + line
-                else:
-                    current_subtitle["text"] = line
-            i += 1
-            
+            for raw_line in f:
+                line = raw_line.strip()
+
+                # 序号行
+                if line.isdigit():
+                    if current_subtitle:
+                        subtitles.append(current_subtitle)
+                    current_subtitle = {"index": int(line)}
+                    continue
+
+                # 时间戳行
+                if '-->' in line:
+                    timestamps = line.split(' --> ')
+                    current_subtitle["start_time"] = timestamps[0].strip()
+                    current_subtitle["end_time"] = timestamps[1].strip()
+                    current_subtitle["text"] = ""
+                    continue
+
+                # 文本行
+                if line and current_subtitle:
+                    if current_subtitle["text"]:
+                        current_subtitle["text"] += " " + line
+                    else:
+                        current_subtitle["text"] = line
+
         # 添加最后一个字幕
         if current_subtitle:
             subtitles.append(current_subtitle)
-            
+
         return subtitles
     
     def verify_timestamp(self, srt_file: str, analysis_result: Dict) -> Dict:
@@ -573,9 +573,13 @@ class SubtitleAnalyzer:
         }
         
         try:
-            # 读取原始字幕
-            subtitles = self.read_srt_file(srt_file)
-            
+            # 读取原始字幕（如果process_subtitle_file刚解析过同一文件则直接复用）
+            cached_path, cached_subtitles = self._srt_cache
+            if cached_path == srt_file and cached_subtitles is not None:
+                subtitles = cached_subtitles
+            else:
+                subtitles = self.read_srt_file(srt_file)
+
             # 创建时间段映射
             segment_map = {}
             for subtitle in subtitles:
@@ -2,9 +2,14 @@
 文字处理相关的函数模块
 """
 import os
+import hashlib
 from PIL import Image, ImageDraw, ImageFont
 from video_synthesis.config.settings import TEXT_SETTINGS, FONT_OPTIONS
 
+# 已渲染文字图缓存：参数指纹 -> PNG路径。3D+描边效果每个标题要上百次
+# draw.text调用，批量模式中重复的文字组合直接复用之前渲染的图片
+_overlay_cache = {}
+
 def calculate_font_size(text: str, base_size: int, max_width: int, font_path: str) -> int:
     """计算适合的字体大小
     Args:
@@ -54,6 +59,14 @@ def create_text_overlay(title1: str, title2: str, bottom_text: str, width: int,
     Returns:
         str: 生成的图片路径
     """
+    # 相同文字组合+尺寸直接命中缓存；路径带指纹，并行工作进程间
+    # 也不会像固定的text_overlay.png那样互相覆盖
+    key = (title1, title2, bottom_text, width, height)
+    cached = _overlay_cache.get(key)
+    if cached is not None and os.path.exists(cached):
+        return cached
+    digest = hashlib.md5(repr(key).encode('utf-8')).hexdigest()[:16]
+
     img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     
@@ -133,7 +146,9 @@ def create_text_overlay(title1: str, title2: str, bottom_text: str, width: int,
     draw_bottom_text(bottom_x, bottom_y, bottom_text, bottom_font)
     
     # 保存临时图片
-    os.makedirs("temp", exist_ok=True)
-    temp_path = os.path.join("temp", "text_overlay.png")
+    cache_dir = os.path.join("temp", "text_cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = os.path.join(cache_dir, f"text_overlay_{digest}.png")
     img.save(temp_path)
+    _overlay_cache[key] = temp_path
     return temp_path 
\ No newline at end of file
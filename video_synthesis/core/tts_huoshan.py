@@ -8,11 +8,17 @@ import base64
 import json
 import uuid
 import os
+import shutil
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Dict, List
 import re
 
+from video_synthesis.utils import tts_cache
+from video_synthesis.utils.file_utils import write_bytes_atomic
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -34,21 +40,37 @@ VOICE_TYPES = {
     "解说小帅多情感": "BV437_streaming"
 }
 
+# 模块级共享会话：所有转换器实例（含不同音色）复用同一批TCP+TLS连接，
+# 连接池容量覆盖并行合成的并发度
+_session = None
+
+def _get_session():
+    """取共享的HTTP会话（首次调用时创建并挂载连接池）"""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16))
+    return _session
+
 class TTSConverter:
     """火山引擎TTS转换器"""
     
-    def __init__(self, voice_type="影视解说小帅"):
+    def __init__(self, voice_type="影视解说小帅", use_cache=True):
         """
         初始化TTS转换器
-        
+
         Args:
             voice_type (str): 声音类型，默认为影视解说小帅
+            use_cache (bool): 是否启用磁盘缓存，相同文本+音色跨次运行不重复请求API
         """
         self.voice_type = VOICE_TYPES.get(voice_type, "BV411_streaming")
+        self.use_cache = use_cache
         self.header = {
             "Authorization": f"Bearer;{access_token}",  # 注意这里使用分号
             "Content-Type": "application/json"
         }
+        # 复用模块级共享连接池，批量合成时省去每次请求的握手开销
+        self.session = _get_session()
         logging.info(f"TTS转换器初始化完成，使用声音类型: {voice_type}")
         
     def _get_request_json(self, text: str, emotion: str = None, pitch: int = 0, rate: int = 0, volume: int = 0) -> Dict:
@@ -117,11 +139,24 @@ class TTSConverter:
             bool: 转换是否成功
         """
         try:
+            # 先查磁盘缓存：键覆盖音色和全部韵律参数，任一变化都不会误命中
+            cache_key = f"{self.voice_type}|{emotion}|{pitch}|{rate}|{volume}|{text}"
+            if self.use_cache:
+                cached = tts_cache.lookup(cache_key)
+                if cached:
+                    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                    try:
+                        os.link(cached, output_path)
+                    except OSError:
+                        shutil.copyfile(cached, output_path)
+                    logging.info(f"缓存命中，跳过TTS请求: {output_path}")
+                    return True
+
             logging.info(f"开始转换文本: {text}")
             request_json = self._get_request_json(text, emotion, pitch, rate, volume)
             logging.debug(f"请求JSON: {json.dumps(request_json, ensure_ascii=False, indent=2)}")
             
-            resp = requests.post(api_url, json=request_json, headers=self.header)
+            resp = self.session.post(api_url, json=request_json, headers=self.header)
             logging.debug(f"API响应状态码: {resp.status_code}")
             
             if resp.status_code != 200:
@@ -132,10 +167,11 @@ class TTSConverter:
             logging.debug(f"API响应: {json.dumps(result, ensure_ascii=False, indent=2)}")
             
             if "data" in result:
-                data = result["data"]
+                audio = base64.b64decode(result["data"])
                 os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                with open(output_path, "wb") as f:
-                    f.write(base64.b64decode(data))
+                write_bytes_atomic(output_path, audio)
+                if self.use_cache:
+                    tts_cache.store(cache_key, audio)
                 logging.info(f"音频文件已保存: {output_path}")
                 return True
             else:
@@ -165,83 +201,107 @@ class TTSConverter:
             cleaned = 'unnamed'
         return cleaned
 
-    def convert_subtitle_items(self, analysis_result: Dict, output_dir: str):
+    def _convert_dedup(self, text: str, output_path: str, seen: Dict[str, str]) -> bool:
         """
-        转换字幕分析结果中的所有项目
-        
+        转换文本为音频，相同文本只请求一次API
+
+        同一批分析结果中重复出现的文本（如常见单词）直接
+        硬链接到首次生成的文件，避免冗余的TTS请求。
+
+        Args:
+            text (str): 要转换的文本
+            output_path (str): 输出音频文件路径
+            seen (Dict[str, str]): 本次运行中已生成文本到文件路径的映射
+
+        Returns:
+            bool: 转换是否成功
+        """
+        src = seen.get(text)
+        if src and os.path.exists(src):
+            if os.path.abspath(src) == os.path.abspath(output_path):
+                return True
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            try:
+                os.link(src, output_path)
+            except OSError:
+                # 跨文件系统或已存在时退化为复制
+                shutil.copyfile(src, output_path)
+            logging.info(f"复用已生成的音频: {os.path.basename(src)} -> {os.path.basename(output_path)}")
+            return True
+
+        if self.convert_to_audio(text, output_path):
+            seen[text] = output_path
+            return True
+        return False
+
+    def _iter_tts_jobs(self, analysis_result: Dict, output_dir: str):
+        """展开分析结果中的全部合成任务
+
+        三个类别、每条目最多三种音频（英文/中文/注释）统一展开为
+        (文本, 输出路径) 任务流，下游不再需要按类别分支。
+
         Args:
             analysis_result (Dict): 字幕分析结果
             output_dir (str): 输出目录
+
+        Yields:
+            tuple: (要合成的文本, 输出音频文件路径)
         """
-        # 确保输出目录存在
-        os.makedirs(output_dir, exist_ok=True)
-        logging.info(f"开始处理分析结果，输出目录: {output_dir}")
-        
-        # 转换词汇
-        vocab_dir = os.path.join(output_dir, "vocabulary")
-        os.makedirs(vocab_dir, exist_ok=True)
-        logging.info("开始处理词汇...")
-        for item in analysis_result.get("vocabulary", []):
-            # 英文版本 (text)
-            if "text" in item:
-                en_filename = f"{self._clean_filename(item['text'].replace(' ', '_'))}_en.mp3"
-                if self.convert_to_audio(
-                    item['text'],
-                    os.path.join(vocab_dir, en_filename)
-                ):
-                    logging.info(f"成功生成英文词汇音频: {en_filename}")
-            
-            # 中文版本 (chinese)
-            if "chinese" in item:
-                zh_filename = f"{self._clean_filename(item['text'].replace(' ', '_'))}_zh.mp3"
-                if self.convert_to_audio(
-                    item['chinese'],
-                    os.path.join(vocab_dir, zh_filename)
-                ):
-                    logging.info(f"成功生成中文词汇音频: {zh_filename}")
-            
-            # 注释版本 (notes)
-            if "notes" in item and item["notes"]:
-                notes_filename = f"{self._clean_filename(item['text'].replace(' ', '_'))}_notes.mp3"
-                if self.convert_to_audio(
-                    item['notes'],
-                    os.path.join(vocab_dir, notes_filename)
-                ):
-                    logging.info(f"成功生成词汇注释音频: {notes_filename}")
-                
-        # 转换短语和表达
-        for category in ["phrases", "expressions"]:
+        for category in ("vocabulary", "phrases", "expressions"):
             category_dir = os.path.join(output_dir, category)
-            os.makedirs(category_dir, exist_ok=True)
-            logging.info(f"开始处理{category}...")
             for item in analysis_result.get(category, []):
-                # 英文版本 (text)
-                if "text" in item:
-                    en_filename = f"{self._clean_filename(item['text'].replace(' ', '_'))}_en.mp3"
-                    if self.convert_to_audio(
-                        item['text'],
-                        os.path.join(category_dir, en_filename)
-                    ):
-                        logging.info(f"成功生成英文{category}音频: {en_filename}")
-                
-                # 中文版本 (chinese)
+                if "text" not in item:
+                    continue
+                base = self._clean_filename(item['text'].replace(' ', '_'))
+                yield item['text'], os.path.join(category_dir, f"{base}_en.mp3")
                 if "chinese" in item:
-                    zh_filename = f"{self._clean_filename(item['text'].replace(' ', '_'))}_zh.mp3"
-                    if self.convert_to_audio(
-                        item['chinese'],
-                        os.path.join(category_dir, zh_filename)
-                    ):
-                        logging.info(f"成功生成中文{category}音频: {zh_filename}")
-                
-                # 注释版本 (notes)
-                if "notes" in item and item["notes"]:
-                    notes_filename = f"{self._clean_filename(item['text'].replace(' ', '_'))}_notes.mp3"
-                    if self.convert_to_audio(
-                        item['notes'],
-                        os.path.join(category_dir, notes_filename)
-                    ):
-                        logging.info(f"成功生成{category}注释音频: {notes_filename}")
-        
+                    yield item['chinese'], os.path.join(category_dir, f"{base}_zh.mp3")
+                if item.get("notes"):
+                    yield item['notes'], os.path.join(category_dir, f"{base}_notes.mp3")
+
+    def convert_subtitle_items(self, analysis_result: Dict, output_dir: str, max_workers: int = 3):
+        """
+        转换字幕分析结果中的所有项目
+
+        合成任务以HTTP往返为主，逐条串行时CPU完全闲置；
+        改为先展开全部任务、对唯一文本并行请求TTS（并发度即
+        限流阈值），重复文本在合成完成后硬链接到首次结果。
+
+        Args:
+            analysis_result (Dict): 字幕分析结果
+            output_dir (str): 输出目录
+            max_workers (int): 并发请求数，默认3，兼作接口限流
+        """
+        # 确保输出目录和三个类别子目录存在
+        for category in ("vocabulary", "phrases", "expressions"):
+            os.makedirs(os.path.join(output_dir, category), exist_ok=True)
+        logging.info(f"开始处理分析结果，输出目录: {output_dir}")
+
+        # 展开任务并按文本去重：首次出现的路径走合成，其余只做链接
+        primary = {}
+        duplicates = []
+        for text, output_path in self._iter_tts_jobs(analysis_result, output_dir):
+            if text in primary:
+                duplicates.append((text, output_path))
+            else:
+                primary[text] = output_path
+
+        logging.info("共 %d 个任务（唯一文本 %d 个，并发 %d）",
+                     len(primary) + len(duplicates), len(primary), max_workers)
+
+        # 唯一文本并行合成；线程数本身就是对远端接口的限流
+        seen = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {text: executor.submit(self.convert_to_audio, text, path)
+                       for text, path in primary.items()}
+            for text, future in futures.items():
+                if future.result():
+                    seen[text] = primary[text]
+
+        # 重复文本链接/复制到首次生成的文件（失败的文本会重试一次合成）
+        for text, output_path in duplicates:
+            self._convert_dedup(text, output_path, seen)
+
         logging.info("所有音频生成完成")
 
 if __name__ == '__main__':
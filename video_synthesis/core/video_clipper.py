@@ -5,11 +5,22 @@
 import os
 import json
 import re
+import hashlib
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 import logging
 from datetime import datetime
 
+from video_synthesis.utils.ffmpeg_utils import get_h264_encoder_args
+
+# 预编译的清理用正则，避免每个条目都重新编译
+_RE_BANG = re.compile(r'[?!]')
+_RE_ILLEGAL = re.compile(r'[<>:"/\\|?*]')
+
+# SRT时间戳格式：时:分:秒,毫秒
+_RE_TIMESTAMP = re.compile(r'(\d+):(\d+):(\d+),(\d+)')
+
 class VideoTypes:
     """视频类型常量"""
     EN = "en"
@@ -20,7 +31,11 @@ class VideoTypes:
 
 class VideoClipper:
     """视频剪辑器"""
-    
+
+    # 分析结果中的三类条目，处理逻辑完全一致，仅类别名不同
+    _CATEGORIES = ('vocabulary', 'phrases', 'expressions')
+
+
     def __init__(self, video_path: str, json_path: str, audio_dir: str, generate_types: List[str] = None):
         """初始化视频剪辑器
         Args:
@@ -35,6 +50,24 @@ class VideoClipper:
         self.output_dir = "output/clips"  # 默认输出目录
         self.generate_types = generate_types if generate_types is not None else ["enzh"]  # 设置默认生成类型
         
+        # 音频时长缓存：路径 -> 秒数，同一文件只探测一次；
+        # 跨次运行持久化到output/.cache/，热启动不再fork ffprobe
+        self._duration_cache = {}
+        self._cache_path = os.path.join(
+            "output", ".cache",
+            f"{hashlib.sha1(os.path.abspath(video_path).encode('utf-8')).hexdigest()}.json")
+        self._persisted = self._cache_load()
+
+        # 分析结果缓存，JSON只解析一次
+        self._analysis = None
+
+        # 并行模式标志：多个ffmpeg同时运行时限制每个进程的线程数
+        self._parallel = False
+
+        # 音频文件索引（首次使用时一次scandir建立），
+        # 查找音频从逐文件stat变为O(1)集合成员判断
+        self._audio_index = None
+
         # 配置日志
         self.logger = self._setup_logger()
         
@@ -46,12 +79,15 @@ class VideoClipper:
         # 创建logs目录
         os.makedirs("logs", exist_ok=True)
         
+        # 时间戳只格式化一次，logger名与日志文件名保持一致
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
         # 创建日志记录器
-        logger = logging.getLogger(f"VideoClipper_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        logger = logging.getLogger(f"VideoClipper_{timestamp}")
         logger.setLevel(logging.DEBUG)
-        
+
         # 创建文件处理器
-        log_file = f"logs/video_clipper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        log_file = f"logs/video_clipper_{timestamp}.log"
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
         
@@ -84,79 +120,99 @@ class VideoClipper:
             str: 清理后的文件名
         """
         # 1. 替换问号和感叹号为下划线
-        filename = re.sub(r'[?!]', '_', filename)
-        
+        filename = _RE_BANG.sub('_', filename)
+
         # 2. 替换空格为下划线
         filename = filename.replace(' ', '_')
-        
+
         # 3. 移除其他非法字符
-        filename = re.sub(r'[<>:"/\\|?*]', '', filename)
-        
+        filename = _RE_ILLEGAL.sub('', filename)
+
         # 4. 确保文件名不为空
         if not filename:
             filename = "unnamed"
-            
+
         return filename
         
     def _load_analysis(self) -> Dict[str, Any]:
-        """加载分析结果
+        """加载分析结果（解析结果缓存，重复调用不再重读JSON）
         Returns:
             Dict: 分析结果数据
         """
+        if self._analysis is not None:
+            return self._analysis
         try:
             with open(self.json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                self._analysis = json.load(f)
+                return self._analysis
         except Exception as e:
-            print(f"❌ 读取分析文件失败: {str(e)}")
+            self.logger.error("读取分析文件失败: %s", e)
             return {}
-            
-    def _get_audio_paths(self, item_type: str, item_id: str) -> Dict[str, str]:
-        """获取音频文件路径
+
+    def _clean_audio_id(self, item_id: str) -> str:
+        """清理项目ID，生成音频文件名使用的形式
         Args:
-            item_type: 项目类型（vocabulary/phrases/expressions）
-            item_id: 项目ID
+            item_id: 原始项目ID
         Returns:
-            Dict[str, str]: 音频文件路径字典，键为类型（en/zh/notes），值为路径
+            str: 清理后的ID（与TTS生成音频时的命名规则一致）
         """
         # 1. 移除末尾的问号
         clean_id = item_id.rstrip('?')
         # 2. 替换空格为下划线
         clean_id = clean_id.replace(' ', '_')
         # 3. 移除其他非法字符
-        clean_id = re.sub(r'[<>:"/\\|?*]', '', clean_id)
-        
+        return _RE_ILLEGAL.sub('', clean_id)
+
+    def _get_audio_index(self) -> set:
+        """获取音频文件路径集合（首次调用时一次性扫描建立）
+
+        每个类别子目录只做一次os.scandir；此后所有条目的音频查找
+        都是集合成员判断，不再对每个候选路径发起stat系统调用。
+        Returns:
+            set: 所有已存在的mp3文件路径
+        """
+        if self._audio_index is None:
+            index = set()
+            for category in self._CATEGORIES:
+                sub_dir = os.path.join(self.audio_dir, category)
+                if not os.path.isdir(sub_dir):
+                    continue
+                with os.scandir(sub_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith('.mp3'):
+                            index.add(entry.path)
+            self._audio_index = index
+            self.logger.debug("音频索引建立完成，共 %d 个文件", len(index))
+        return self._audio_index
+
+    def _get_audio_paths(self, item_type: str, item_id: str) -> Dict[str, str]:
+        """获取音频文件路径
+        Args:
+            item_type: 项目类型（vocabulary/phrases/expressions）
+            item_id: 项目ID
+        Returns:
+            Dict[str, str]: 音频文件路径字典，键为类型（en/zh/notes），值为路径
+        """
+        clean_id = self._clean_audio_id(item_id)
+
         base_path = os.path.join(self.audio_dir, item_type, clean_id)
         
-        self.logger.info(f"\n开始查找音频文件:")
-        self.logger.info(f"- 项目类型: {item_type}")
-        self.logger.info(f"- 项目ID: {item_id}")
-        self.logger.info(f"- 清理后ID: {clean_id}")
-        self.logger.info(f"- 基础路径: {base_path}")
-        
+        # 逐条目的查找细节降级为DEBUG（%s延迟格式化，未启用时零开销），
+        # 只有缺失情况保留在WARNING/ERROR级别
+        self.logger.debug("查找音频文件: 类型=%s ID=%s 基础路径=%s", item_type, item_id, base_path)
+
+        audio_index = self._get_audio_index()
         paths = {}
         for audio_type in ['en', 'zh', 'notes']:
             path = f"{base_path}_{audio_type}.mp3"
-            self.logger.info(f"\n检查音频文件: {path}")
-            if os.path.exists(path):
+            if path in audio_index:
                 paths[audio_type] = path
-                self.logger.info(f"✅ 找到音频文件: {path}")
-                # 检查文件大小
-                file_size = os.path.getsize(path)
-                self.logger.info(f"   文件大小: {file_size/1024:.2f} KB")
+                self.logger.debug("找到音频文件: %s", path)
             else:
-                self.logger.warning(f"❌ 未找到音频文件: {path}")
-                # 检查目录是否存在
-                dir_path = os.path.dirname(path)
-                if not os.path.exists(dir_path):
-                    self.logger.error(f"❌ 目录不存在: {dir_path}")
-                
+                self.logger.warning("未找到音频文件: %s", path)
+
         if not paths:
-            self.logger.error(f"❌ 未找到任何音频文件")
-        else:
-            self.logger.info(f"\n找到的音频文件:")
-            for audio_type, path in paths.items():
-                self.logger.info(f"- {audio_type}: {path}")
-                
+            self.logger.error("未找到任何音频文件: %s", item_id)
         return paths
         
     def _parse_timestamp(self, timestamp: str) -> float:
@@ -166,28 +222,82 @@ class VideoClipper:
         Returns:
             float: 秒数
         """
-        try:
-            # 分离时分秒和毫秒
-            main_part, ms_part = timestamp.split(',')
-            h, m, s = main_part.split(':')
-            
-            # 转换为秒
-            total_seconds = int(h) * 3600 + int(m) * 60 + int(s)
-            total_seconds += int(ms_part) / 1000
-            
-            return total_seconds
-        except Exception as e:
-            print(f"❌ 解析时间戳失败: {timestamp}")
+        # 单个预编译正则一次取出四段，替代两级split+逐段转换
+        match = _RE_TIMESTAMP.match(timestamp)
+        if not match:
+            self.logger.error("解析时间戳失败: %s", timestamp)
             return 0.0
+        h, m, s, ms = map(int, match.groups())
+        return h * 3600 + m * 60 + s + ms / 1000
             
+    def _run_ffmpeg(self, cmd: List[str]) -> subprocess.CompletedProcess:
+        """静默执行ffmpeg命令
+
+        附加-loglevel error -nostats，stderr只剩真正的错误信息；
+        stdout直接丢弃，不再把ffmpeg的逐帧进度输出解码进Python。
+        Args:
+            cmd: ffmpeg命令列表
+        Returns:
+            subprocess.CompletedProcess: 执行结果，stderr已解码为字符串
+        """
+        extra = ['-loglevel', 'error', '-nostats']
+        if self._parallel:
+            # 并行模式下每个ffmpeg限制单线程，调度器总线程数=工作线程数，
+            # 避免 进程数 × 核心数 的上下文切换抖动；单任务模式不加限制。
+            # -filter_threads/-filter_complex_threads是全局选项，放在命令
+            # 开头即生效；-threads在首个-i之前只限制第一路输入的解码线程，
+            # 必须同时作为输出选项（紧挨输出文件）再注入一次，
+            # 才能真正压住libx264默认 ~1.5×核心数 的编码线程
+            extra += ['-threads', '1', '-filter_threads', '1', '-filter_complex_threads', '1']
+            cmd = cmd[:-1] + ['-threads', '1', cmd[-1]]
+        cmd = cmd[:1] + extra + cmd[1:]
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        # 仅在需要时解码stderr（成功时基本为空）
+        result.stderr = result.stderr.decode('utf-8', errors='replace') if result.stderr else ''
+        return result
+
+    def _cache_load(self) -> Dict[str, Any]:
+        """读取持久化的音频时长缓存
+
+        缓存文件按视频路径的sha1命名，条目为 路径 -> [mtime_ns, 大小, 时长]，
+        文件被重写后mtime/大小变化会自动使旧条目失效。
+        Returns:
+            Dict[str, Any]: 缓存内容，读不到时为空字典
+        """
+        try:
+            with open(self._cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _cache_save(self):
+        """把本次探测到的音频时长写回持久化缓存"""
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            with open(self._cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self._persisted, f)
+        except OSError as e:
+            self.logger.warning("写入时长缓存失败: %s", e)
+
     def _get_audio_duration(self, audio_path: str) -> float:
-        """获取音频文件时长
+        """获取音频文件时长（结果缓存，重复查询不再fork ffprobe）
+
+        先查进程内缓存，再查持久化缓存（按mtime/大小校验），
+        都未命中才探测并把结果写入两级缓存。
         Args:
             audio_path: 音频文件路径
         Returns:
             float: 音频时长（秒）
         """
+        cached = self._duration_cache.get(audio_path)
+        if cached is not None:
+            return cached
         try:
+            stat = os.stat(audio_path)
+            entry = self._persisted.get(audio_path)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self._duration_cache[audio_path] = entry[2]
+                return entry[2]
             cmd = [
                 'ffprobe',
                 '-v', 'error',
@@ -196,10 +306,12 @@ class VideoClipper:
                 audio_path
             ]
             duration = float(subprocess.check_output(cmd).decode().strip())
-            print(f"🎵 音频时长: {duration:.3f}秒")
+            self.logger.debug("音频时长: %.3f秒 (%s)", duration, audio_path)
+            self._duration_cache[audio_path] = duration
+            self._persisted[audio_path] = [stat.st_mtime_ns, stat.st_size, duration]
             return duration
         except Exception as e:
-            print(f"❌ 获取音频时长失败: {str(e)}")
+            self.logger.error("获取音频时长失败: %s", e)
             return 0.0
         
     def _clip_video(self, start_time: float, end_time: float, audio_path: str, output_path: str) -> bool:
@@ -208,221 +320,82 @@ class VideoClipper:
             # 1. 获取音频时长
             audio_duration = self._get_audio_duration(audio_path)
             if audio_duration == 0:
-                print(f"❌ 音频时长为0，跳过处理")
+                self.logger.error("音频时长为0，跳过处理")
                 return False
                 
-            # 2. 创建模糊定格视频
-            blur_video = self._create_blurred_freeze_video(
-                self.video_path,
-                start_time,
-                audio_duration
-            )
-            
-            if not blur_video:
-                return False
-                
-            # 3. 合并视频和音频
-            cmd = [
-                'ffmpeg', '-y',
-                '-i', blur_video,
-                '-i', audio_path,
-                '-c:v', 'copy',
-                '-c:a', 'aac',
-                '-b:a', '192k',
-                '-ar', '44100',
-                '-ac', '2',
-                output_path
-            ]
-            
-            print(f"🔊 合并音频命令:")
-            print(f"   {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # 4. 清理临时文件
-            if os.path.exists(blur_video):
-                os.remove(blur_video)
-                print(f"🧹 清理临时文件: {blur_video}")
-            
-            if result.returncode != 0:
-                print(f"❌ 合并音频失败:")
-                print(f"   错误输出: {result.stderr}")
-                return False
-            
-            return True
+            # 2. 单次ffmpeg渲染定格片段并封装音频
+            return self._render_freeze_clip(start_time, audio_duration,
+                                            [audio_path], output_path)
             
         except Exception as e:
-            print(f"❌ 处理视频片段失败: {str(e)}")
+            self.logger.error("处理视频片段失败: %s", e)
             return False
 
-    def _merge_audio_files(self, audio_paths: Dict[str, str], output_audio: str) -> bool:
-        """合并多个音频文件，按固定顺序：en -> zh -> notes"""
-        try:
-            self.logger.info(f"开始合并音频文件:")
-            self.logger.info(f"- 音频文件: {audio_paths}")
-            self.logger.info(f"- 输出路径: {output_audio}")
-            
-            # 按固定顺序准备音频文件
-            audio_sequence = ['en', 'zh']  # 只使用英文和中文
-            audio_files = []
-            
-            # 验证所有必需的音频文件
-            for audio_type in audio_sequence:
-                if audio_type not in audio_paths:
-                    self.logger.error(f"缺少{audio_type}音频文件")
-                    return False
-                    
-                audio_file = audio_paths[audio_type]
-                if not os.path.exists(audio_file):
-                    self.logger.error(f"音频文件不存在: {audio_file}")
-                    return False
-                    
-                # 检查音频文件大小
-                file_size = os.path.getsize(audio_file)
-                if file_size == 0:
-                    self.logger.error(f"音频文件为空: {audio_file}")
-                    return False
-                self.logger.info(f"- {audio_type}音频文件大小: {file_size} 字节")
-                
-                audio_files.append(audio_file)
-            
-            # 构建ffmpeg命令
-            filter_complex = []
-            inputs = []
-            for i, audio_file in enumerate(audio_files):
-                inputs.extend(['-i', audio_file])
-                filter_complex.append(f'[{i}:a]')
-            
-            # 使用concat过滤器合并音频
-            filter_str = f"{''.join(filter_complex)}concat=n={len(audio_files)}:v=0:a=1[outa]"
-            
-            cmd = [
-                'ffmpeg', '-y'
-            ] + inputs + [
-                '-filter_complex', filter_str,
-                '-map', '[outa]',
-                '-c:a', 'aac',
-                '-b:a', '192k',
-                '-ar', '44100',
-                '-ac', '2',
-                output_audio
-            ]
-            
-            self.logger.info(f"合并音频命令:")
-            self.logger.info(f"命令: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                self.logger.error(f"合并音频失败:")
-                self.logger.error(f"错误输出: {result.stderr}")
-                return False
-                
-            # 检查合并后的音频文件
-            if not os.path.exists(output_audio):
-                self.logger.error(f"合并后的音频文件不存在: {output_audio}")
-                return False
-                
-            merged_size = os.path.getsize(output_audio)
-            if merged_size == 0:
-                self.logger.error(f"合并后的音频文件为空")
-                return False
-            self.logger.info(f"合并后的音频文件大小: {merged_size} 字节")
-            
-            self.logger.info(f"音频合并成功: {output_audio}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"合并音频失败: {str(e)}", exc_info=True)
-            return False
+    def _render_freeze_clip(self, start_time: float, duration: float,
+                            audio_files: List[str], output_path: str,
+                            blur_strength: int = 20) -> bool:
+        """单次ffmpeg渲染模糊定格片段并封装音频
 
-    def _create_blurred_freeze_video(self, video_path: str, start_time: float, duration: float, blur_strength: int = 20) -> str:
-        """创建模糊定格视频
+        seek到目标帧、boxblur、loop定格、音频concat、封装全部在
+        同一张滤镜图里完成：不再走"提取PNG->静帧转mp4->合并"的
+        三段式流程，整个片段只spawn一个ffmpeg进程，也没有临时文件。
         Args:
-            video_path: 输入视频路径
-            start_time: 开始时间点（用于提取第一帧）
-            duration: 定格持续时长
+            start_time: 定格帧所在时间点
+            duration: 定格时长（秒）
+            audio_files: 按顺序拼接的音频文件列表
+            output_path: 输出视频路径
             blur_strength: 模糊强度
+        Returns:
+            bool: 是否成功
         """
-        try:
-            self.logger.info(f"开始创建模糊定格视频:")
-            self.logger.info(f"- 输入视频: {video_path}")
-            self.logger.info(f"- 开始时间: {start_time:.3f}秒")
-            self.logger.info(f"- 定格时长: {duration:.3f}秒")
-            self.logger.info(f"- 模糊强度: {blur_strength}")
-            
-            # 临时文件路径
-            temp_dir = os.path.dirname(video_path)
-            temp_frame = os.path.join(temp_dir, "temp_first_frame.png")
-            temp_blur_video = os.path.join(temp_dir, "temp_blur.mp4")
-            
-            # 1. 提取指定时间点的帧并应用模糊效果
-            cmd = [
-                'ffmpeg', '-y',
-                '-ss', f"{start_time:.3f}",  # 从指定时间点开始
-                '-i', video_path,
-                '-vframes', '1',  # 只提取一帧
-                '-vf', f"boxblur={blur_strength}:2:{blur_strength}:2:0",
-                temp_frame
-            ]
-            
-            self.logger.info(f"提取并模糊第一帧:")
-            self.logger.info(f"命令: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                self.logger.error(f"提取帧失败:")
-                self.logger.error(f"错误输出: {result.stderr}")
-                return None
-            
-            if not os.path.exists(temp_frame):
-                self.logger.error(f"提取的帧文件不存在: {temp_frame}")
-                return None
-            
-            self.logger.info(f"成功提取并模糊第一帧: {temp_frame}")
-            
-            # 2. 将模糊帧转换为视频
-            cmd = [
-                'ffmpeg', '-y',
-                '-loop', '1',
-                '-i', temp_frame,
-                '-t', f"{duration}",
-                '-c:v', 'libx264',
-                '-tune', 'stillimage',
-                '-pix_fmt', 'yuv420p',
-                '-b:v', '2500k',
-                temp_blur_video
-            ]
-            
-            self.logger.info(f"生成模糊定格视频:")
-            self.logger.info(f"命令: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # 清理临时帧文件
-            if os.path.exists(temp_frame):
-                os.remove(temp_frame)
-                self.logger.info(f"清理临时帧文件: {temp_frame}")
-            
-            if result.returncode != 0:
-                self.logger.error(f"生成模糊视频失败:")
-                self.logger.error(f"错误输出: {result.stderr}")
-                return None
-            
-            if not os.path.exists(temp_blur_video):
-                self.logger.error(f"生成的模糊视频文件不存在: {temp_blur_video}")
-                return None
-            
-            # 验证生成的视频文件大小
-            video_size = os.path.getsize(temp_blur_video)
-            if video_size == 0:
-                self.logger.error(f"生成的模糊视频文件为空")
-                return None
-            self.logger.info(f"模糊视频文件大小: {video_size} 字节")
-            
-            self.logger.info(f"成功生成模糊定格视频: {temp_blur_video}")
-            return temp_blur_video
-            
-        except Exception as e:
-            self.logger.error(f"创建模糊定格视频失败: {str(e)}", exc_info=True)
-            return None
+        # -ss放在-i之前：输入端快速seek，不解码目标点之前的内容
+        inputs = ['-ss', f"{start_time:.3f}", '-i', self.video_path]
+        for audio_file in audio_files:
+            inputs.extend(['-i', audio_file])
+
+        # 取第一帧 -> 模糊 -> 单帧无限循环 -> 按定格时长截断
+        video_chain = (
+            f"[0:v]trim=end_frame=1,setpts=PTS-STARTPTS,"
+            f"boxblur={blur_strength}:2:{blur_strength}:2:0,"
+            f"loop=loop=-1:size=1:start=0,trim=duration={duration:.3f},"
+            f"setpts=PTS-STARTPTS,fps=25,format=yuv420p[outv]"
+        )
+        if len(audio_files) > 1:
+            concat_inputs = ''.join(f'[{i + 1}:a]' for i in range(len(audio_files)))
+            filter_str = f"{video_chain};{concat_inputs}concat=n={len(audio_files)}:v=0:a=1[outa]"
+            audio_map = '[outa]'
+        else:
+            filter_str = video_chain
+            audio_map = '1:a'
+
+        # 编码器按进程探测一次：有NVENC走GPU，否则libx264（静帧调优）
+        encoder_args = list(get_h264_encoder_args())
+        if 'libx264' in encoder_args:
+            encoder_args += ['-tune', 'stillimage']  # x264专属tune值
+
+        cmd = ['ffmpeg', '-y'] + inputs + [
+            '-filter_complex', filter_str,
+            '-map', '[outv]',
+            '-map', audio_map,
+        ] + encoder_args + [
+            '-b:v', '2500k',
+            '-c:a', 'aac',
+            '-b:a', '192k',
+            '-ar', '44100',
+            '-ac', '2',
+            '-shortest',
+            output_path
+        ]
+
+        self.logger.info(f"渲染模糊定格片段:")
+        self.logger.info(f"命令: {' '.join(cmd)}")
+        result = self._run_ffmpeg(cmd)
+
+        if result.returncode != 0:
+            self.logger.error(f"渲染定格片段失败:")
+            self.logger.error(f"错误输出: {result.stderr}")
+            return False
+        return True
 
     def _create_complete_version(self, start_time: float, end_time: float, 
                            audio_paths: Dict[str, str], output_path: str) -> bool:
@@ -434,75 +407,58 @@ class VideoClipper:
             self.logger.info(f"- 音频文件: {audio_paths}")
             self.logger.info(f"- 输出路径: {output_path}")
             
-            # 1. 合并音频文件
-            temp_audio = output_path + ".temp.aac"
-            if not self._merge_audio_files(audio_paths, temp_audio):
-                self.logger.error("合并音频文件失败")
+            # 1. 校验en/zh音频文件
+            audio_files = self._collect_audio_files(audio_paths, ['en', 'zh'])
+            if audio_files is None:
                 return False
-            
-            # 2. 获取音频总时长
-            total_audio_duration = self._get_audio_duration(temp_audio)
+
+            # 2. 音频总时长 = 各段时长之和（concat无缝拼接），
+            # 省去对合并结果再fork一次ffprobe
+            total_audio_duration = sum(self._get_audio_duration(p) for p in audio_files)
             if total_audio_duration == 0:
                 self.logger.error("获取音频时长失败或音频时长为0")
-                if os.path.exists(temp_audio):
-                    os.remove(temp_audio)
                 return False
-            
-            # 3. 直接创建模糊定格视频（使用开始时间点的帧）
-            blur_video = self._create_blurred_freeze_video(
-                self.video_path,
-                start_time,
-                total_audio_duration
-            )
-            
-            if not blur_video:
-                self.logger.error("创建模糊定格视频失败")
-                return False
-            
-            # 4. 合并模糊视频和音频
-            cmd = [
-                'ffmpeg', '-y',
-                '-i', blur_video,
-                '-i', temp_audio,
-                '-c:v', 'copy',
-                '-c:a', 'aac',
-                '-b:a', '192k',
-                output_path
-            ]
-            
-            self.logger.info(f"合并音频命令:")
-            self.logger.info(f"命令: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # 5. 清理临时文件
-            if os.path.exists(blur_video):
-                os.remove(blur_video)
-                self.logger.info(f"清理临时文件: {blur_video}")
-            if os.path.exists(temp_audio):
-                os.remove(temp_audio)
-                self.logger.info(f"清理临时文件: {temp_audio}")
-            
-            if result.returncode != 0:
-                self.logger.error(f"合并音频失败:")
-                self.logger.error(f"错误输出: {result.stderr}")
+
+            # 3. 单次ffmpeg渲染定格片段并封装全部音频，无临时文件
+            if not self._render_freeze_clip(start_time, total_audio_duration,
+                                            audio_files, output_path):
                 return False
-            
+
             self.logger.info(f"成功生成完整版视频: {os.path.basename(output_path)}")
             return True
-            
+
         except Exception as e:
             self.logger.error(f"创建完整版视频失败: {str(e)}", exc_info=True)
-            # 确保清理所有临时文件
-            for temp_file in [
-                output_path + ".temp.aac",
-                output_path + ".temp.mp4",
-                output_path + ".final.mp4",
-                output_path + ".concat.txt"
-            ]:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
             return False
 
+    def _collect_audio_files(self, audio_paths: Dict[str, str], audio_sequence: List[str]) -> Optional[List[str]]:
+        """按固定顺序校验并收集音频文件
+        Args:
+            audio_paths: 音频文件路径字典
+            audio_sequence: 需要的音频类型顺序（如['en', 'zh']）
+        Returns:
+            Optional[List[str]]: 音频文件路径列表，缺失或为空时返回None
+        """
+        audio_files = []
+        for audio_type in audio_sequence:
+            if audio_type not in audio_paths:
+                self.logger.error(f"缺少{audio_type}音频文件")
+                return None
+
+            audio_file = audio_paths[audio_type]
+            if not os.path.exists(audio_file):
+                self.logger.error(f"音频文件不存在: {audio_file}")
+                return None
+
+            file_size = os.path.getsize(audio_file)
+            if file_size == 0:
+                self.logger.error(f"音频文件为空: {audio_file}")
+                return None
+            self.logger.info(f"- {audio_type}音频文件大小: {file_size} 字节")
+
+            audio_files.append(audio_file)
+        return audio_files
+
     def _create_enzh_version(self, start_time: float, end_time: float, 
                            audio_paths: Dict[str, str], output_path: str) -> bool:
         """创建英文+中文版本视频
@@ -521,195 +477,121 @@ class VideoClipper:
             self.logger.info(f"- 音频文件: {audio_paths}")
             self.logger.info(f"- 输出路径: {output_path}")
             
-            # 1. 检查必需的音频文件
-            required_types = ['en', 'zh']
-            enzh_audio_paths = {}
-            
-            for audio_type in required_types:
-                if audio_type not in audio_paths:
-                    self.logger.error(f"缺少{audio_type}音频文件")
-                    return False
-                if not os.path.exists(audio_paths[audio_type]):
-                    self.logger.error(f"音频文件不存在: {audio_paths[audio_type]}")
-                    return False
-                enzh_audio_paths[audio_type] = audio_paths[audio_type]
-            
-            # 2. 合并音频文件
-            temp_audio = output_path + ".temp.aac"
-            if not self._merge_audio_files(enzh_audio_paths, temp_audio):
-                self.logger.error("合并音频文件失败")
+            # 1. 校验必需的音频文件
+            audio_files = self._collect_audio_files(audio_paths, ['en', 'zh'])
+            if audio_files is None:
                 return False
-            
-            # 3. 获取音频总时长
-            total_audio_duration = self._get_audio_duration(temp_audio)
+
+            # 2. 音频总时长 = 英文+中文两段之和，不再探测合并后的文件
+            total_audio_duration = sum(self._get_audio_duration(p) for p in audio_files)
             if total_audio_duration == 0:
                 self.logger.error("获取音频时长失败或音频时长为0")
-                if os.path.exists(temp_audio):
-                    os.remove(temp_audio)
                 return False
-            
-            # 4. 创建模糊定格视频
-            blur_video = self._create_blurred_freeze_video(
-                self.video_path,
-                start_time,
-                total_audio_duration
-            )
-            
-            if not blur_video:
-                self.logger.error("创建模糊定格视频失败")
-                return False
-            
-            # 5. 合并模糊视频和音频
-            cmd = [
-                'ffmpeg', '-y',
-                '-i', blur_video,
-                '-i', temp_audio,
-                '-c:v', 'copy',
-                '-c:a', 'aac',
-                '-b:a', '192k',
-                output_path
-            ]
-            
-            self.logger.info(f"合并音频命令:")
-            self.logger.info(f"命令: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # 6. 清理临时文件
-            if os.path.exists(blur_video):
-                os.remove(blur_video)
-                self.logger.info(f"清理临时文件: {blur_video}")
-            if os.path.exists(temp_audio):
-                os.remove(temp_audio)
-                self.logger.info(f"清理临时文件: {temp_audio}")
-            
-            if result.returncode != 0:
-                self.logger.error(f"合并音频失败:")
-                self.logger.error(f"错误输出: {result.stderr}")
+
+            # 3. 单次ffmpeg渲染定格片段并封装音频，无临时文件
+            if not self._render_freeze_clip(start_time, total_audio_duration,
+                                            audio_files, output_path):
                 return False
-            
+
             self.logger.info(f"成功生成英文+中文版本视频: {os.path.basename(output_path)}")
             return True
-            
+
         except Exception as e:
             self.logger.error(f"创建英文+中文版本视频失败: {str(e)}", exc_info=True)
-            # 确保清理所有临时文件
-            for temp_file in [
-                output_path + ".temp.aac",
-                output_path + ".temp.mp4"
-            ]:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
             return False
 
+    def _process_item(self, category: str, item: Dict[str, Any]) -> Optional[str]:
+        """处理单个条目，生成对应的视频片段
+        Args:
+            category: 项目类型（vocabulary/phrases/expressions）
+            item: 分析结果中的单个条目
+        Returns:
+            Optional[str]: 生成的视频路径，失败或跳过时返回None
+        """
+        if 'start_time' not in item or 'end_time' not in item or 'text' not in item:
+            return None
+
+        start_time = self._parse_timestamp(item['start_time'])
+        end_time = self._parse_timestamp(item['end_time'])
+        item_id = item['text']
+
+        # 获取音频文件路径
+        audio_paths = self._get_audio_paths(category, item_id)
+        if not audio_paths:
+            return None
+
+        # 设置输出路径
+        clean_id = self._clean_filename(item_id)
+
+        # 创建对应的输出子目录
+        output_subdir = os.path.join(self.output_dir, category, clean_id)
+        os.makedirs(output_subdir, exist_ok=True)
+
+        # 创建英文+中文版本视频
+        enzh_output_path = os.path.join(output_subdir, f"{clean_id}_enzh.mp4")
+        self.logger.debug("处理英文+中文版本视频: %s (%.2fs - %.2fs)", item_id, start_time, end_time)
+
+        if self._create_enzh_version(start_time, end_time, audio_paths, enzh_output_path):
+            # 每个条目只输出一行INFO总结，避免并行时争抢终端锁
+            self.logger.info("✅ 生成英文+中文版本视频: %s", os.path.basename(enzh_output_path))
+            return enzh_output_path
+        return None
+
     def process_clips(self) -> List[str]:
         """处理所有视频片段
+
+        各条目输出到独立文件且互不依赖，用线程池并行分发；
+        真正的活都在ffmpeg子进程里，不受GIL限制。
         Returns:
             List[str]: 生成的视频片段路径列表
         """
         # 创建输出目录
         os.makedirs(self.output_dir, exist_ok=True)
-        
+
         # 加载分析结果
         data = self._load_analysis()
         if not data:
             return []
-            
+
+        # 收集所有待处理条目（三个类别走同一套逻辑，按表驱动展开）
+        tasks = [(category, item)
+                 for category in self._CATEGORIES
+                 for item in data.get(category, [])]
+
+        if not tasks:
+            return []
+
+        # 并行度限制为核心数的一半，避免无节制地同时起ffmpeg
+        max_workers = max(1, min(len(tasks), (os.cpu_count() or 2) // 2))
+        self._parallel = max_workers > 1
+        self.logger.info(f"并行处理 {len(tasks)} 个条目（{max_workers} 个工作线程）")
+
         result_clips = []
-        
-        # 处理词汇
-        if 'vocabulary' in data:
-            for item in data['vocabulary']:
-                if 'start_time' not in item or 'end_time' not in item or 'text' not in item:
-                    continue
-                    
-                start_time = self._parse_timestamp(item['start_time'])
-                end_time = self._parse_timestamp(item['end_time'])
-                item_id = item['text']
-                
-                # 获取音频文件路径
-                audio_paths = self._get_audio_paths('vocabulary', item_id)
-                if not audio_paths:
-                    print(f"⚠️ 未找到任何音频文件: {item_id}")
-                    continue
-                
-                # 设置输出路径
-                clean_id = self._clean_filename(item_id)
-                
-                # 创建对应的输出子目录
-                output_subdir = os.path.join(self.output_dir, "vocabulary", clean_id)
-                os.makedirs(output_subdir, exist_ok=True)
-                
-                # 创建英文+中文版本视频
-                enzh_output_path = os.path.join(output_subdir, f"{clean_id}_enzh.mp4")
-                print(f"\n🎬 处理英文+中文版本视频: {item_id}")
-                print(f"⏱️ 时间范围: {start_time:.2f}s - {end_time:.2f}s")
-                
-                if self._create_enzh_version(start_time, end_time, audio_paths, enzh_output_path):
-                    result_clips.append(enzh_output_path)
-                    print(f"✅ 生成英文+中文版本视频: {os.path.basename(enzh_output_path)}")
-        
-        # 处理短语
-        if 'phrases' in data:
-            for item in data['phrases']:
-                if 'start_time' not in item or 'end_time' not in item or 'text' not in item:
-                    continue
-                    
-                start_time = self._parse_timestamp(item['start_time'])
-                end_time = self._parse_timestamp(item['end_time'])
-                item_id = item['text']
-                
-                # 获取音频文件路径
-                audio_paths = self._get_audio_paths('phrases', item_id)
-                if not audio_paths:
-                    print(f"⚠️ 未找到任何音频文件: {item_id}")
-                    continue
-                
-                # 设置输出路径
-                clean_id = self._clean_filename(item_id)
-                
-                # 创建对应的输出子目录
-                output_subdir = os.path.join(self.output_dir, "phrases", clean_id)
-                os.makedirs(output_subdir, exist_ok=True)
-                
-                # 创建英文+中文版本视频
-                enzh_output_path = os.path.join(output_subdir, f"{clean_id}_enzh.mp4")
-                print(f"\n🎬 处理英文+中文版本视频: {item_id}")
-                print(f"⏱️ 时间范围: {start_time:.2f}s - {end_time:.2f}s")
-                
-                if self._create_enzh_version(start_time, end_time, audio_paths, enzh_output_path):
-                    result_clips.append(enzh_output_path)
-                    print(f"✅ 生成英文+中文版本视频: {os.path.basename(enzh_output_path)}")
-        
-        # 处理表达
-        if 'expressions' in data:
-            for item in data['expressions']:
-                if 'start_time' not in item or 'end_time' not in item or 'text' not in item:
-                    continue
-                    
-                start_time = self._parse_timestamp(item['start_time'])
-                end_time = self._parse_timestamp(item['end_time'])
-                item_id = item['text']
-                
-                # 获取音频文件路径
-                audio_paths = self._get_audio_paths('expressions', item_id)
-                if not audio_paths:
-                    print(f"⚠️ 未找到任何音频文件: {item_id}")
-                    continue
-                
-                # 设置输出路径
-                clean_id = self._clean_filename(item_id)
-                
-                # 创建对应的输出子目录
-                output_subdir = os.path.join(self.output_dir, "expressions", clean_id)
-                os.makedirs(output_subdir, exist_ok=True)
-                
-                # 创建英文+中文版本视频
-                enzh_output_path = os.path.join(output_subdir, f"{clean_id}_enzh.mp4")
-                print(f"\n🎬 处理英文+中文版本视频: {item_id}")
-                print(f"⏱️ 时间范围: {start_time:.2f}s - {end_time:.2f}s")
-                
-                if self._create_enzh_version(start_time, end_time, audio_paths, enzh_output_path):
-                    result_clips.append(enzh_output_path)
-                    print(f"✅ 生成英文+中文版本视频: {os.path.basename(enzh_output_path)}")
-        
-        return result_clips 
\ No newline at end of file
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # 先并发预热音频时长缓存：ffprobe是I/O密集型，批量探测
+            # 与最早启动的编码任务重叠，渲染阶段直接命中缓存
+            prefetch = [p for category, item in tasks if 'text' in item
+                        for p in self._candidate_audio_paths(category, item['text'])]
+            for _ in executor.map(self._get_audio_duration, prefetch):
+                pass
+            for clip_path in executor.map(lambda task: self._process_item(*task), tasks):
+                if clip_path:
+                    result_clips.append(clip_path)
+
+        # 本次新探测的时长写回磁盘，下次运行直接命中
+        self._cache_save()
+
+        return result_clips
+
+    def _candidate_audio_paths(self, item_type: str, item_id: str) -> List[str]:
+        """列出条目实际存在的音频文件路径（不产生日志，供预热用）
+        Args:
+            item_type: 项目类型
+            item_id: 项目ID
+        Returns:
+            List[str]: 存在的音频文件路径
+        """
+        base_path = os.path.join(self.audio_dir, item_type, self._clean_audio_id(item_id))
+        audio_index = self._get_audio_index()
+        candidates = [f"{base_path}_{audio_type}.mp3" for audio_type in ('en', 'zh', 'notes')]
+        return [path for path in candidates if path in audio_index] 
\ No newline at end of file
@@ -6,7 +6,7 @@ import tempfile
 import logging
 from datetime import datetime
 from video_synthesis.config.settings import VIDEO_SETTINGS, PATH_SETTINGS, TEXT_SETTINGS
-from video_synthesis.utils.ffmpeg_utils import get_video_duration, get_video_dimensions, run_ffmpeg_command
+from video_synthesis.utils.ffmpeg_utils import get_video_duration, get_video_dimensions, run_ffmpeg_command, get_h264_encoder_args
 from video_synthesis.core.text_processor import create_text_overlay
 from video_synthesis.core.video_processor import get_output_filename
 from rich import console
@@ -292,7 +292,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         logger.error(f"字幕合并过程出错: {str(e)}")
         return None
 
-def combine_videos(background_video, main_video, side_videos, output_path, main_x=None, side_x=None, title1="默认主标题", title2="默认副标题", bottom_text="默认底部文字", add_subtitles=True):
+def combine_videos(background_video, main_video, side_videos, output_path, main_x=None, side_x=None, title1="默认主标题", title2="默认副标题", bottom_text="默认底部文字", add_subtitles=True, overlay_png=None):
     """合并所有视频
     Args:
         background_video: 背景视频路径
@@ -305,6 +305,8 @@ def combine_videos(background_video, main_video, side_videos, output_path, main_
         title2: 副标题
         bottom_text: 底部文字
         add_subtitles: 是否添加SRT字幕，默认True
+        overlay_png: 叠加图片路径（如tv.png），在同一张滤镜图内完成叠加，
+                     避免输出后再整片解码+再编码一遍
     """
     logger.info("\n" + "="*50)
     logger.info("视频合成处理开始")
@@ -474,21 +476,33 @@ def combine_videos(background_video, main_video, side_videos, output_path, main_
     # 添加字幕（如果启用并且存在）
     if add_subtitles and merged_ass and os.path.exists(merged_ass):
         merged_ass = merged_ass.replace("\\", "/")
-        filter_complex.append(f'[{last_bg}]ass={merged_ass}[final]')
+        filter_complex.append(f'[{last_bg}]ass={merged_ass}[subbed]')
+        last_bg = 'subbed'
         logger.info("字幕添加成功")
     else:
-        filter_complex.append(f'[{last_bg}]null[final]')
         logger.info("跳过字幕添加")
+
+    # 图片叠加融合进同一张滤镜图（与add_image_overlay相同的0:0叠加）
+    if overlay_png:
+        overlay_idx = len(inputs) + 1  # 文字叠加图之后的下一个输入
+        input_args.extend(['-i', overlay_png])
+        filter_complex.append(f'[{last_bg}][{overlay_idx}:v]overlay=0:0[final]')
+        logger.info(f"图片叠加已融合进滤镜图: {overlay_png}")
+    else:
+        filter_complex.append(f'[{last_bg}]null[final]')
     
-    # 完成视频合并
+    # 完成视频合并（先写同目录的临时文件，结束后一次os.replace进目标位置）
+    tmp_output = f"{output_path}.tmp.mp4"
     filter_str = ';'.join(filter_complex)
+    # 最终编码优先走GPU（检测到NVENC时），CPU留给并行的其他视频
+    encoder_args = list(get_h264_encoder_args())
+    if 'libx264' in encoder_args:
+        encoder_args += ['-tune', 'fastdecode']  # nvenc不认识x264的tune值
     cmd = ['ffmpeg', '-y'] + input_args + [
         '-filter_complex', filter_str,
         '-map', '[final]',
         '-map', '1:a',
-        '-c:v', 'libx264',
-        '-preset', 'ultrafast',
-        '-tune', 'fastdecode',
+    ] + encoder_args + [
         '-profile:v', 'baseline',
         '-level', '3.0',
         '-maxrate', '2000k',
@@ -498,14 +512,17 @@ def combine_videos(background_video, main_video, side_videos, output_path, main_
         '-c:a', 'aac',
         '-b:a', '192k',
         '-shortest',
-        output_path
+        tmp_output
     ]
-    
+
     print("\n完整的ffmpeg命令:")
     print(' '.join(cmd))
-    
+
     run_ffmpeg_command(cmd, "合并视频")
-    
+
+    # 原子替换到目标路径：编码中途失败不会留下半截的输出文件
+    os.replace(tmp_output, output_path)
+
     return output_path
 
 def add_image_overlay(input_video: str, overlay_image: str, output_video: str):
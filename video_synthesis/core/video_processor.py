@@ -6,7 +6,7 @@ import random
 import logging
 from datetime import datetime
 from video_synthesis.utils.ffmpeg_utils import run_ffmpeg_command, get_video_duration, get_video_dimensions
-from video_synthesis.config.settings import VIDEO_SETTINGS
+from video_synthesis.config.settings import VIDEO_SETTINGS, TEXT_SETTINGS
 import glob
 import time
 from ..utils.file_utils import load_history, save_history
@@ -206,7 +206,7 @@ def create_main_video(input_video, output_video, scale=None, outline_enabled=Fal
         'ffmpeg', '-i', input_video,
         '-vf', filter_str,
         '-c:v', 'libx264',  # 视频编码器
-        '-preset', 'medium',  # 编码器预设
+        '-preset', VIDEO_SETTINGS.get('X264_PRESET', 'ultrafast'),  # 编码器预设
         '-c:a', 'copy',      # 复制音频流
         '-y',
         temp_output
@@ -283,7 +283,7 @@ def create_main_video(input_video, output_video, scale=None, outline_enabled=Fal
                 'ffmpeg', '-i', temp_output,
                 '-vf', subtitle_filter,
                 '-c:v', 'libx264',
-                '-preset', 'medium',
+                '-preset', VIDEO_SETTINGS.get('X264_PRESET', 'ultrafast'),
                 '-c:a', 'copy',
                 '-y',
                 output_video
@@ -318,6 +318,20 @@ def create_side_video(input_video, output_video, scale=None, target_height=None)
     
     # 计算目标尺寸
     if target_height is not None:
+        # 输入高度已经等于裁切后的最终高度（预先归一化过的素材，
+        # 比如本函数之前的输出）时，再走缩放+裁切只会放大后切边；
+        # 直接流拷贝重封装，省掉整个解码+编码过程
+        if height == target_height and width % 2 == 0:
+            cmd = [
+                'ffmpeg', '-i', input_video,
+                '-c:v', 'copy',
+                '-an',
+                '-y',
+                output_video
+            ]
+            run_ffmpeg_command(cmd, f"右侧视频已符合目标尺寸，流拷贝: {os.path.basename(input_video)}")
+            return
+
         # 计算缩放比例 = 目标高度(裁切后) / (原始高度 - 100)
         # 因为我们需要考虑到最终会裁切掉上下各50像素
         scale = (target_height + 100) / height
@@ -337,7 +351,7 @@ def create_side_video(input_video, output_video, scale=None, target_height=None)
         target_height += 1
     
     print(f"目标视频尺寸: {target_width}x{target_height}")
-    
+
     # 构建滤镜命令
     filter_complex = [
         f'scale={target_width}:{target_height}',
@@ -350,7 +364,7 @@ def create_side_video(input_video, output_video, scale=None, target_height=None)
         'ffmpeg', '-i', input_video,
         '-vf', filter_str,
         '-c:v', 'libx264',     # 视频编码器
-        '-preset', 'ultrafast', # 最快的编码速度
+        '-preset', VIDEO_SETTINGS.get('X264_PRESET', 'ultrafast'), # 最快的编码速度
         '-crf', '28',          # 较低的视频质量（文件更小，处理更快）
         '-tune', 'fastdecode', # 优化解码速度
         '-an',                 # 移除音频
@@ -468,6 +482,173 @@ def process_pip2_videos(main_video_path, pip2_folder):
     # 生成视频序列
     return generate_pip2_sequence(pip2_folder, target_duration)
 
+def build_pipeline_graph(main_video, side_videos, overlay_image=None,
+                         background_type='blur', blur_sigma=None,
+                         main_scale=None, main_x=0, text_overlay=None):
+    """构建把背景、主视频、侧视频和图片叠加融合为一张滤镜图
+
+    所有中间结果都停留在滤镜图内部，不再向temp目录写入
+    background.mp4/main.mp4/side_*.mp4等中间文件，也省去了
+    每一跳的解码+再编码。
+
+    Args:
+        main_video (str): 主视频路径
+        side_videos (list): 侧视频源路径列表（未经缩放的原始视频）
+        overlay_image (str): 叠加图片路径（如tv.png），None表示不叠加
+        background_type (str): 背景类型，'blur' 或 'black'
+        blur_sigma (float): 高斯模糊程度
+        main_scale (float): 主视频缩放比例
+        main_x (int): 主视频x坐标
+        text_overlay (str): 文字叠加图片路径，None表示不叠加
+    Returns:
+        tuple: (输入文件列表, filter_complex字符串, 输出流标签)
+    """
+    if blur_sigma is None:
+        blur_sigma = VIDEO_SETTINGS['BLUR_SIGMA']
+    if main_scale is None:
+        main_scale = VIDEO_SETTINGS['MAIN_VIDEO_SCALE']
+
+    width, height = get_video_dimensions(main_video)
+    crop_margin = VIDEO_SETTINGS['CROP_MARGIN']
+
+    # 主视频缩放后的尺寸（确保是2的倍数）
+    out_width = int(width * main_scale)
+    out_height = int(height * main_scale)
+    if out_width % 2 != 0:
+        out_width += 1
+    if out_height % 2 != 0:
+        out_height += 1
+    main_height = out_height - crop_margin * 2
+    side_x = out_width
+
+    inputs = [main_video] + list(side_videos)
+    filter_complex = []
+
+    # 主视频拆成背景和前景两路
+    filter_complex.append('[0:v]split=2[bg_src][main_src]')
+
+    # 背景：高斯模糊+黑色遮罩，或纯黑
+    if background_type == 'blur':
+        filter_complex.append(
+            f'[bg_src]gblur=sigma={blur_sigma},format=rgba,split[b1][b2];'
+            f'[b1]format=rgba,geq=r=0:g=0:b=0:a=0.7*255[mask];'
+            f'[b2][mask]overlay=0:0[bg]'
+        )
+    else:
+        filter_complex.append('[bg_src]drawbox=color=black:t=fill[bg]')
+
+    # 主视频缩放裁切后叠加到背景
+    filter_complex.append(
+        f'[main_src]scale={out_width}:{out_height},'
+        f'crop=iw:ih-{crop_margin*2}:0:{crop_margin}[main]')
+    filter_complex.append(f'[bg][main]overlay=x={main_x}:y=(H-h)/2[t0]')
+
+    # 侧视频按时间顺序叠加到右侧
+    last = 't0'
+    current_time = 0.0
+    for i, video in enumerate(side_videos):
+        src_width, src_height = get_video_dimensions(video)
+        duration = get_video_duration(video)
+        # 与create_side_video相同的缩放逻辑：按裁切前高度对齐
+        scale = (main_height + crop_margin * 2) / src_height
+        target_width = int(src_width * scale)
+        target_height = int(src_height * scale)
+        if target_width % 2 != 0:
+            target_width += 1
+        if target_height % 2 != 0:
+            target_height += 1
+
+        filter_complex.append(
+            f'[{i+1}:v]scale={target_width}:{target_height},'
+            f'crop=iw:ih-{crop_margin*2}:0:{crop_margin},'
+            f'setpts=PTS-STARTPTS+{current_time}/TB[side{i}]')
+        next_label = f't{i+1}'
+        filter_complex.append(
+            f'[{last}][side{i}]overlay=x={side_x}:y=(H-h)/2:'
+            f"enable='between(t,{current_time},{current_time + duration})'"
+            f'[{next_label}]')
+        last = next_label
+        current_time += duration
+
+    # 文字叠加图片（与video_combiner中相同的显示/淡出逻辑）
+    if text_overlay:
+        idx = len(inputs)
+        inputs.append(text_overlay)
+        text_duration = TEXT_SETTINGS.get('TEXT_OVERLAY_DURATION', 4)
+        fade_out = TEXT_SETTINGS.get('FADE_OUT_DURATION', 0.5)
+        next_label = f'{last}_text'
+        if fade_out:
+            filter_complex.append(
+                f'[{idx}:v]format=rgba,'
+                f'fade=out:st={text_duration - fade_out}:d={fade_out}[text_faded]')
+            filter_complex.append(
+                f'[{last}][text_faded]overlay=0:0:'
+                f"enable='between(t,0,{text_duration})'[{next_label}]")
+        else:
+            filter_complex.append(
+                f'[{last}][{idx}:v]overlay=0:0:'
+                f"enable='between(t,0,{text_duration})'[{next_label}]")
+        last = next_label
+
+    # 图片叠加（tv边框，与add_tv_overlay相同的缩放和位置）
+    if overlay_image:
+        idx = len(inputs)
+        inputs.append(overlay_image)
+        filter_complex.append(f'[{idx}:v]scale=iw/2:-1[tv]')
+        filter_complex.append(f'[{last}][tv]overlay=0:-300[fused_out]')
+        last = 'fused_out'
+
+    return inputs, ';'.join(filter_complex), last
+
+def run_fused_pipeline(main_video, side_videos, output_path, background_type='blur',
+                       overlay_image=None, text_overlay=None, main_x=0):
+    """用单次ffmpeg调用完成整个合成流水线
+    Args:
+        main_video (str): 主视频路径
+        side_videos (list): 侧视频源路径列表
+        output_path (str): 输出文件路径
+        background_type (str): 背景类型，'blur' 或 'black'
+        overlay_image (str): 叠加图片路径（如tv.png）
+        text_overlay (str): 文字叠加图片路径
+        main_x (int): 主视频x坐标
+    Returns:
+        str: 输出文件路径
+    """
+    inputs, filter_str, out_label = build_pipeline_graph(
+        main_video, side_videos,
+        overlay_image=overlay_image,
+        background_type=background_type,
+        main_x=main_x,
+        text_overlay=text_overlay
+    )
+
+    input_args = []
+    for input_file in inputs:
+        input_args.extend(['-i', input_file])
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    cmd = ['ffmpeg', '-y'] + input_args + [
+        '-filter_complex', filter_str,
+        '-map', f'[{out_label}]',
+        '-map', '0:a',
+        '-c:v', 'libx264',
+        '-preset', VIDEO_SETTINGS.get('X264_PRESET', 'ultrafast'),
+        '-tune', 'fastdecode',
+        '-profile:v', 'baseline',
+        '-level', '3.0',
+        '-maxrate', '2000k',
+        '-bufsize', '4000k',
+        '-pix_fmt', 'yuv420p',
+        '-r', '30',
+        '-c:a', 'aac',
+        '-b:a', '192k',
+        '-shortest',
+        output_path
+    ]
+    run_ffmpeg_command(cmd, "融合流水线合成")
+    return output_path
+
 def add_tv_overlay(input_video, output_video):
     """在视频最后添加TV图片叠加
     Args:
@@ -515,7 +696,7 @@ def add_tv_overlay(input_video, output_video):
             '-i', tv_image_escaped,
             '-filter_complex', filter_str,
             '-c:v', 'libx264',
-            '-preset', 'medium',
+            '-preset', VIDEO_SETTINGS.get('X264_PRESET', 'ultrafast'),
             '-c:a', 'copy',
             '-y',
             output_video
@@ -643,7 +824,7 @@ def combine_videos(background_video, main_video, side_videos, output_path, main_
         '-map', f'[{last_bg}]',
         '-map', '1:a',
         '-c:v', 'libx264',
-        '-preset', 'ultrafast',
+        '-preset', VIDEO_SETTINGS.get('X264_PRESET', 'ultrafast'),
         '-tune', 'fastdecode',
         '-profile:v', 'baseline',
         '-level', '3.0',
@@ -15,8 +15,10 @@ import cv2
 import numpy as np
 import subprocess
 import math
+import threading
 import traceback
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 # 添加项目根目录到 Python 路径
 current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -912,27 +914,50 @@ def main():
             logger.error(traceback.format_exc())
             return
         
-        # 处理每种类型的视频
-        for item_type in ['vocabulary', 'phrases', 'expressions']:
-            if item_type in analysis_data:
-                logger.info(f"\n处理 {item_type} 类型的视频")
-                logger.info(f"共有 {len(analysis_data[item_type])} 个项目待处理")
-                
-                for i, item in enumerate(analysis_data[item_type], 1):
-                    text = item['text']
-                    logger.info(f"\n处理第 {i} 个项目: {text}")
-                    
-                    # 获取视频路径
-                    input_video, output_video = get_clip_path(analysis_dir, item_type, text)
-                    logger.info(f"输入视频: {input_video}")
-                    logger.info(f"输出视频: {output_video}")
-                    
-                    # 处理视频
-                    if process_clip(input_video, output_video, item):
-                        logger.info(f"✅ 成功处理: {text}")
-                    else:
-                        logger.error(f"❌ 处理失败: {text}")
-                        
+        # 全局信号量限制同时运行的FFmpeg进程数，防止多类别并行时CPU超订
+        ffmpeg_slots = threading.Semaphore(os.cpu_count() or 4)
+
+        def process_item(item_type, i, item):
+            """处理单个项目（受全局FFmpeg并发上限约束）"""
+            text = item['text']
+            logger.info(f"\n处理第 {i} 个{item_type}项目: {text}")
+
+            # 获取视频路径
+            input_video, output_video = get_clip_path(analysis_dir, item_type, text)
+            logger.info(f"输入视频: {input_video}")
+            logger.info(f"输出视频: {output_video}")
+
+            # 处理视频
+            with ffmpeg_slots:
+                success = process_clip(input_video, output_video, item)
+            if success:
+                logger.info(f"✅ 成功处理: {text}")
+            else:
+                logger.error(f"❌ 处理失败: {text}")
+
+        def process_category(item_type):
+            """并行处理一个类别下的所有项目"""
+            items = analysis_data[item_type]
+            logger.info(f"\n处理 {item_type} 类型的视频")
+            logger.info(f"共有 {len(items)} 个项目待处理")
+
+            # 线程数设常数上限即可（真正的ffmpeg并发由信号量控制），
+            # 并保留future逐个取结果，工作线程里的异常照常抛到main的except
+            with ThreadPoolExecutor(max_workers=min(8, max(1, len(items)))) as inner:
+                futures = [inner.submit(process_item, item_type, i, item)
+                           for i, item in enumerate(items, 1)]
+                for future in futures:
+                    future.result()
+
+        # 三个类别相互独立，外层并行处理；同样回收结果让异常冒出来
+        item_types = [t for t in ['vocabulary', 'phrases', 'expressions'] if t in analysis_data]
+        if item_types:
+            with ThreadPoolExecutor(max_workers=len(item_types)) as outer:
+                futures = [outer.submit(process_category, item_type)
+                           for item_type in item_types]
+                for future in futures:
+                    future.result()
+
         logger.info("="*80)
         logger.info("处理完成")
         
@@ -6,36 +6,52 @@ import os
 import json
 import logging
 from datetime import datetime
-from video_synthesis.core.tts_huoshan import TTSConverter
+from video_synthesis.utils.file_utils import count_entries
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f'logs/audio_generation_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-        logging.StreamHandler()
-    ]
-)
+try:
+    # 分析结果可能有数百条中文条目，orjson解析明显更快；装没装都能跑
+    import orjson
+except ImportError:
+    orjson = None
+
+def _setup_logging():
+    """配置日志（进入main才创建日志文件，单纯导入本模块不触碰logs/）"""
+    os.makedirs('logs', exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(f'logs/audio_generation_{timestamp}.log'),
+            logging.StreamHandler()
+        ]
+    )
 
 def main():
+    _setup_logging()
+
+    # 延迟导入TTS客户端（连带requests等依赖），
+    # 模块被仅为复用工具函数而导入时不付出这份开销
+    from video_synthesis.core.tts_huoshan import TTSConverter
+
     try:
-        # 读取最新的分析结果
+        # 读取最新的分析结果：按文件mtime取最新，
+        # 不再解析文件名里的时间戳（对手工编辑过的文件同样正确）
         subtitles_dir = "subtitles"
-        analysis_files = [f for f in os.listdir(subtitles_dir) if f.startswith("subtitle_analysis_verified_")]
+        analysis_files = [e for e in os.scandir(subtitles_dir)
+                          if e.name.startswith("subtitle_analysis_verified_")]
         if not analysis_files:
             logging.error("未找到分析结果文件")
             return
-            
-        # 获取最新的分析文件
-        latest_file = max(analysis_files, key=lambda x: x.split("_")[-1].split(".")[0])
-        analysis_file = os.path.join(subtitles_dir, latest_file)
+
+        analysis_file = max(analysis_files, key=lambda e: e.stat().st_mtime).path
         
         logging.info(f"使用分析文件: {analysis_file}")
         
         # 读取分析结果
-        with open(analysis_file, 'r', encoding='utf-8') as f:
-            analysis_result = json.load(f)
+        with open(analysis_file, 'rb') as f:
+            raw = f.read()
+        analysis_result = orjson.loads(raw) if orjson is not None else json.loads(raw)
             
         # 创建TTS转换器，使用影视解说小帅音色
         converter = TTSConverter("影视解说小帅")
@@ -52,14 +68,10 @@ def main():
         
         logging.info("音频生成完成")
         
-        # 打印生成的文件数量
-        vocab_dir = os.path.join(output_dir, "vocabulary")
-        phrases_dir = os.path.join(output_dir, "phrases")
-        expressions_dir = os.path.join(output_dir, "expressions")
-        
-        vocab_count = len(os.listdir(vocab_dir)) if os.path.exists(vocab_dir) else 0
-        phrases_count = len(os.listdir(phrases_dir)) if os.path.exists(phrases_dir) else 0
-        expressions_count = len(os.listdir(expressions_dir)) if os.path.exists(expressions_dir) else 0
+        # 打印生成的文件数量（流式统计，不物化目录列表）
+        vocab_count = count_entries(os.path.join(output_dir, "vocabulary"))
+        phrases_count = count_entries(os.path.join(output_dir, "phrases"))
+        expressions_count = count_entries(os.path.join(output_dir, "expressions"))
         
         print("\n生成结果统计:")
         print(f"词汇音频: {vocab_count//2} 个（中英各一个）")
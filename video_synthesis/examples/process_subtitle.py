@@ -6,21 +6,31 @@ import os
 import sys
 import json
 import logging
-import glob
 from datetime import datetime
-from video_synthesis.core.deepseek import SubtitleAnalyzer, save_analysis_results
-from video_synthesis.core.tts_huoshan import TTSConverter
-from video_synthesis.core.video_clipper import VideoClipper
-
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f'logs/subtitle_process_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-        logging.StreamHandler()
-    ]
-)
+
+_logging_configured = False
+
+def _setup_logging():
+    """按需配置日志
+
+    只在真正开始处理时才创建日志文件；-l/--help等轻量路径
+    不再每次都往logs/写一个空日志。时间戳在这里取，
+    避免"导入时定名、稍后才运行"导致的文件名漂移。
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    os.makedirs('logs', exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(f'logs/subtitle_process_{timestamp}.log'),
+            logging.StreamHandler()
+        ]
+    )
+    _logging_configured = True
 
 def get_next_sequence_number(base_dir: str) -> str:
     """
@@ -47,6 +57,29 @@ def get_next_sequence_number(base_dir: str) -> str:
     max_num = max(int(d) for d in existing_dirs)
     return f"{max_num + 1:04d}"
 
+# 进程级实例缓存：批量处理多个视频时复用分析器和TTS转换器，
+# 鉴权、TLS连接池等初始化开销只付一次
+_analyzer = None
+_tts_converters = {}
+
+def _get_analyzer():
+    """取进程内共享的字幕分析器（首次调用时创建）"""
+    global _analyzer
+    if _analyzer is None:
+        from video_synthesis.core.deepseek import SubtitleAnalyzer
+        _analyzer = SubtitleAnalyzer()
+    return _analyzer
+
+def _get_tts_converter(voice_type: str):
+    """按音色取共享的TTS转换器（每种音色只创建一次）
+    Args:
+        voice_type (str): 音色类型
+    """
+    if voice_type not in _tts_converters:
+        from video_synthesis.core.tts_huoshan import TTSConverter
+        _tts_converters[voice_type] = TTSConverter(voice_type)
+    return _tts_converters[voice_type]
+
 def find_english_subtitle(video_name: str) -> str:
     """
     根据视频名称查找对应的英文字幕文件
@@ -59,20 +92,19 @@ def find_english_subtitle(video_name: str) -> str:
     """
     # 构建视频目录路径
     video_dir = os.path.join("assets", "pip1_videos", video_name)
-    if not os.path.exists(video_dir):
+
+    # 一次scandir查找英文字幕文件，不经过glob的fnmatch匹配
+    try:
+        with os.scandir(video_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith("_en.srt"):
+                    return entry.path
+    except OSError:
         logging.error(f"视频目录不存在: {video_dir}")
         return None
-        
-    # 查找英文字幕文件
-    srt_pattern = os.path.join(video_dir, "*_en.srt")
-    srt_files = glob.glob(srt_pattern)
-    
-    if not srt_files:
-        logging.error(f"未找到英文字幕文件: {srt_pattern}")
-        return None
-        
-    # 返回找到的第一个英文字幕文件
-    return srt_files[0]
+
+    logging.error(f"未找到英文字幕文件: {os.path.join(video_dir, '*_en.srt')}")
+    return None
 
 def find_video_file(video_name: str) -> str:
     """
@@ -85,22 +117,21 @@ def find_video_file(video_name: str) -> str:
         str: 视频文件路径，如果未找到则返回None
     """
     video_dir = os.path.join("assets", "pip1_videos", video_name)
-    if not os.path.exists(video_dir):
+
+    # 一次scandir读目录替代逐扩展名exists探测（每次都是一个stat），
+    # 顺带兼容大小写不同的扩展名（如.MP4）
+    video_exts = {'.mp4', '.mkv', '.avi', '.mov'}
+    target = video_name.lower()
+    try:
+        with os.scandir(video_dir) as entries:
+            for entry in entries:
+                name, ext = os.path.splitext(entry.name)
+                if name.lower() == target and ext.lower() in video_exts:
+                    return entry.path
+    except OSError:
         logging.error(f"视频目录不存在: {video_dir}")
         return None
-        
-    # 支持的视频格式
-    video_patterns = [
-        os.path.join(video_dir, f"{video_name}.mp4"),
-        os.path.join(video_dir, f"{video_name}.mkv"),
-        os.path.join(video_dir, f"{video_name}.avi"),
-        os.path.join(video_dir, f"{video_name}.mov")
-    ]
-    
-    for pattern in video_patterns:
-        if os.path.exists(pattern):
-            return pattern
-            
+
     logging.error(f"未找到视频文件: {video_name}.*")
     return None
 
@@ -114,6 +145,13 @@ def process_subtitle(video_name: str = None, subtitle_file: str = None, output_d
         output_dir (str): 输出目录
         voice_type (str): 音色类型
     """
+    _setup_logging()
+
+    # 延迟导入重量级模块（API客户端、ffmpeg相关），
+    # 避免 -l 等轻量操作也付出完整的导入开销
+    from video_synthesis.core.deepseek import save_analysis_results
+    from video_synthesis.core.video_clipper import VideoClipper
+
     try:
         # 如果提供了视频名称，查找对应的字幕文件和视频文件
         video_file = None
@@ -133,28 +171,25 @@ def process_subtitle(video_name: str = None, subtitle_file: str = None, output_d
         # 获取视频文件夹名称
         video_folder = os.path.basename(os.path.dirname(subtitle_file))
         
-        # 创建视频专属的输出目录
+        # 构建输出目录结构
         video_output_dir = os.path.join(output_dir, video_folder)
-        os.makedirs(video_output_dir, exist_ok=True)
-        
-        # 获取序列号并创建序列号子文件夹
         sequence_number = get_next_sequence_number(video_output_dir)
         sequence_dir = os.path.join(video_output_dir, sequence_number)
-        os.makedirs(sequence_dir, exist_ok=True)
-        
-        # 创建时间戳目录
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         analysis_dir = os.path.join(sequence_dir, f"subtitle_{timestamp}")
-        os.makedirs(analysis_dir, exist_ok=True)
-        
+        audio_dir = os.path.join(analysis_dir, "audio")
+
+        # 只创建最深的叶子目录，makedirs会连带创建所有祖先目录
+        os.makedirs(audio_dir, exist_ok=True)
+
         logging.info(f"创建输出目录结构:")
         logging.info(f"- 视频目录: {video_output_dir}")
         logging.info(f"- 序号目录: {sequence_dir}")
         logging.info(f"- 分析目录: {analysis_dir}")
         
-        # 1. 分析字幕
+        # 1. 分析字幕（分析器跨调用复用）
         logging.info("开始分析字幕...")
-        analyzer = SubtitleAnalyzer()
+        analyzer = _get_analyzer()
         results = analyzer.process_subtitle_file(subtitle_file)
         
         if not results:
@@ -194,14 +229,10 @@ def process_subtitle(video_name: str = None, subtitle_file: str = None, output_d
         shutil.copy2(ass_output_path, ass_analysis_path)
         logging.info(f"ASS 字幕已复制到分析目录: {ass_analysis_path}")
         
-        # 2. 生成音频
+        # 2. 生成音频（同音色的转换器跨调用复用）
         logging.info("开始生成音频...")
-        converter = TTSConverter(voice_type)
-        
-        # 设置音频输出目录
-        audio_dir = os.path.join(analysis_dir, "audio")
-        os.makedirs(audio_dir, exist_ok=True)
-        
+        converter = _get_tts_converter(voice_type)
+
         # 转换音频
         converter.convert_subtitle_items(verified_results, audio_dir)
         
@@ -222,26 +253,20 @@ def process_subtitle(video_name: str = None, subtitle_file: str = None, output_d
             else:
                 logging.warning("未生成任何视频片段")
         
-        # 打印统计信息
-        vocab_dir = os.path.join(audio_dir, "vocabulary")
-        phrases_dir = os.path.join(audio_dir, "phrases")
-        expressions_dir = os.path.join(audio_dir, "expressions")
-        
-        vocab_count = len(os.listdir(vocab_dir)) if os.path.exists(vocab_dir) else 0
-        phrases_count = len(os.listdir(phrases_dir)) if os.path.exists(phrases_dir) else 0
-        expressions_count = len(os.listdir(expressions_dir)) if os.path.exists(expressions_dir) else 0
-        
+        # 打印统计信息（一次scandir遍历统计三个子目录，避免多次exists+listdir）
+        counts = {"vocabulary": 0, "phrases": 0, "expressions": 0}
+        with os.scandir(audio_dir) as entries:
+            for entry in entries:
+                if entry.is_dir() and entry.name in counts:
+                    counts[entry.name] = sum(1 for _ in os.scandir(entry.path))
+
         print("\n处理完成！统计信息:")
-        print(f"词汇音频: {vocab_count//3} 个（每个词汇生成英文、中文和注释音频）")
-        print(f"短语音频: {phrases_count//3} 个（每个短语生成英文、中文和注释音频）")
-        print(f"表达音频: {expressions_count//3} 个（每个表达生成英文、中文和注释音频）")
+        print(f"词汇音频: {counts['vocabulary']//3} 个（每个词汇生成英文、中文和注释音频）")
+        print(f"短语音频: {counts['phrases']//3} 个（每个短语生成英文、中文和注释音频）")
+        print(f"表达音频: {counts['expressions']//3} 个（每个表达生成英文、中文和注释音频）")
         print(f"\n输出目录: {analysis_dir}")
         
-        # 确保 subtitles 目录存在
-        if not os.path.exists("subtitles"):
-            os.makedirs("subtitles")
-        
-        # 确保序号目录存在
+        # 确保 subtitles 下的序号目录存在（连带创建上级目录）
         sequence_dir_in_subtitles = os.path.join("subtitles", video_folder, sequence_number)
         os.makedirs(sequence_dir_in_subtitles, exist_ok=True)
         
@@ -258,16 +283,31 @@ def process_subtitle(video_name: str = None, subtitle_file: str = None, output_d
         logging.error(traceback.format_exc())
         return False
 
+def _has_en_subtitle(dir_path: str) -> bool:
+    """判断目录中是否存在英文字幕文件（命中第一个即返回，不全量枚举）
+    Args:
+        dir_path (str): 要检查的目录路径
+    Returns:
+        bool: 是否找到以_en.srt结尾的文件
+    """
+    try:
+        with os.scandir(dir_path) as entries:
+            return any(entry.name.endswith("_en.srt") for entry in entries)
+    except OSError:
+        return False
+
 def list_available_videos():
     """列出assets/pip1_videos目录下所有可用的视频"""
     videos_dir = os.path.join("assets", "pip1_videos")
     if not os.path.exists(videos_dir):
         print("视频目录不存在")
         return
-        
-    videos = [d for d in os.listdir(videos_dir) 
-             if os.path.isdir(os.path.join(videos_dir, d)) and 
-             glob.glob(os.path.join(videos_dir, d, "*_en.srt"))]
+
+    # 外层一次scandir拿到目录类型信息，内层短路检查字幕，
+    # 不再对每个条目做isdir的stat加一次glob全目录匹配
+    with os.scandir(videos_dir) as entries:
+        videos = [entry.name for entry in entries
+                  if entry.is_dir() and _has_en_subtitle(entry.path)]
     
     if not videos:
         print("没有找到包含英文字幕的视频")
@@ -277,6 +317,11 @@ def list_available_videos():
     for video in videos:
         print(f"- {video}")
 
+# ASS字幕行的固定模板（模块级常量，避免循环内重复构造格式串）
+_ASS_DIALOGUE_FMT = ('Dialogue: 0,{s},{e},CN,,0,0,0,,{cn}\n'
+                     'Dialogue: 1,{s},{e},EN,,0,0,0,,{en}\n').format
+_ASS_REQUIRED_KEYS = ('start_time', 'end_time', 'chinese_text', 'english_text')
+
 def generate_ass_subtitle(analysis_results: dict, output_path: str) -> bool:
     """
     生成 ASS 格式的字幕文件
@@ -322,55 +367,51 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         # 3. 确保输出目录存在
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        # 4. 写入文件
-        with open(output_path, 'w', encoding='utf-8') as f:
-            # 写入头部信息
-            f.write(ass_header)
-            logging.info("已写入 ASS 头部信息")
-            
-            # 写入字幕内容
+        # 4. 在内存中组装整个文件，最后一次os.write写出，
+        # 绕过文本IO层的逐次编码和多次write系统调用
+        # 只在启用DEBUG时才做逐条调试输出，避免热循环中无谓的格式化开销
+        debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+        def iter_dialogue_lines():
+            """逐条生成字幕行，供str.join一次性拼接"""
             for i, item in enumerate(subtitle_items, 1):
                 # 数据验证
-                if not all(k in item for k in ['start_time', 'end_time', 'chinese_text', 'english_text']):
+                if not all(k in item for k in _ASS_REQUIRED_KEYS):
                     logging.warning(f"第 {i} 条字幕数据不完整，跳过")
                     continue
-                
-                # 获取时间和文本
-                start_time = item['start_time']
-                end_time = item['end_time']
-                chinese_text = item['chinese_text']
-                english_text = item['english_text']
-                
-                # 记录每条字幕的信息（调试用）
-                logging.debug(f"处理第 {i} 条字幕:")
-                logging.debug(f"  开始时间: {start_time}")
-                logging.debug(f"  结束时间: {end_time}")
-                logging.debug(f"  中文文本: {chinese_text}")
-                logging.debug(f"  英文文本: {english_text}")
-                
-                # 写入字幕
-                f.write(f'Dialogue: 0,{start_time},{end_time},CN,,0,0,0,,{chinese_text}\n')
-                f.write(f'Dialogue: 1,{start_time},{end_time},EN,,0,0,0,,{english_text}\n')
-            
-            logging.info(f"已写入 {len(subtitle_items)} 条字幕")
+
+                # 记录每条字幕的信息（调试用），使用%格式避免禁用时的字符串拼接
+                if debug_enabled:
+                    logging.debug("处理第 %d 条字幕: %s -> %s CN=%s EN=%s",
+                                  i, item['start_time'], item['end_time'],
+                                  item['chinese_text'], item['english_text'])
+
+                yield _ASS_DIALOGUE_FMT(s=item['start_time'], e=item['end_time'],
+                                        cn=item['chinese_text'], en=item['english_text'])
+
+        # str.join一次性分配结果缓冲区，再整体编码
+        buf = (ass_header + ''.join(iter_dialogue_lines())).encode('utf-8')
+
+        fd = os.open(output_path,
+                     os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0),
+                     0o644)
+        try:
+            os.write(fd, buf)
+        finally:
+            os.close(fd)
+        logging.info(f"已写入 {len(subtitle_items)} 条字幕")
         
         # 5. 验证生成的文件
         if not os.path.exists(output_path):
             logging.error("文件未创建成功")
             return False
             
+        # 用文件大小校验完整性即可，无需把刚写入的文件重新读回来
         file_size = os.path.getsize(output_path)
-        if file_size == 0:
-            logging.error("生成的文件为空")
+        if file_size < len(ass_header.encode('utf-8')):
+            logging.error("文件内容不完整")
             return False
-            
-        # 读取并验证内容
-        with open(output_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            if len(content) < len(ass_header):
-                logging.error("文件内容不完整")
-                return False
-                
+
         logging.info(f"ASS 字幕文件生成成功: {output_path}")
         logging.info(f"文件大小: {file_size} 字节")
         return True
@@ -4,12 +4,11 @@
 import os
 import random
 import subprocess
-import glob
 import time
 from datetime import datetime
 import argparse
-import pandas as pd
-import gc
+import atexit
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import shutil
 from rich.console import Console
 from rich.panel import Panel
@@ -18,14 +17,16 @@ from rich import print as rprint
 from PIL import Image, ImageDraw, ImageFont
 from .config.settings import VIDEO_SETTINGS, PATH_SETTINGS, TEXT_SETTINGS, FONT_OPTIONS
 from .utils.file_utils import get_random_video, read_text_from_excel, ensure_directory, cleanup_temp_files
-from .utils.ffmpeg_utils import get_video_duration, get_video_dimensions
+from .utils.ffmpeg_utils import get_video_duration, get_video_dimensions, warm_probe_cache
 from .core.video_processor import (
     create_blurred_background,
     create_black_background,
     create_main_video,
     create_side_video,
-    process_pip2_videos
+    process_pip2_videos,
+    run_fused_pipeline
 )
+from .core.text_processor import create_text_overlay
 from .core.video_combiner import combine_videos, add_image_overlay
 
 # 创建rich控制台对象
@@ -62,31 +63,13 @@ def print_summary(output_path, start_time, video_duration):
 def cleanup_resources():
     """清理资源和临时文件"""
     try:
-        # 清理临时目录
+        # rmtree一次递归删除整个临时目录，
+        # 不再先listdir逐项stat+unlink后又rmtree重复遍历
         temp_dir = os.path.normpath(PATH_SETTINGS['TEMP_DIR'])
         if os.path.exists(temp_dir):
-            # 先尝试删除目录中的所有文件
-            for filename in os.listdir(temp_dir):
-                file_path = os.path.join(temp_dir, filename)
-                try:
-                    if os.path.isfile(file_path):
-                        os.unlink(file_path)
-                    elif os.path.isdir(file_path):
-                        shutil.rmtree(file_path)
-                except Exception as e:
-                    console.print(f"[red]清理文件失败: {file_path}, 错误: {str(e)}")
-            
-            # 然后尝试删除目录本身
-            try:
-                shutil.rmtree(temp_dir)
-                console.print(f"[green]已清理临时目录: {temp_dir}")
-            except Exception as e:
-                console.print(f"[red]删除临时目录失败: {str(e)}")
-        
-        # 强制垃圾回收
-        gc.collect()
-        console.print("[green]已释放内存")
-        
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            console.print(f"[green]已清理临时目录: {temp_dir}")
+
     except Exception as e:
         console.print(f"[red]清理资源时出错: {str(e)}")
 
@@ -107,36 +90,64 @@ def parse_args():
                        type=str,
                        default='video_texts.xlsx',
                        help='Excel文件路径，包含要添加的文字内容')
+    parser.add_argument('--max-workers',
+                       type=int,
+                       default=max(1, (os.cpu_count() or 2) // 2),
+                       help='自动模式下并行处理的进程数（默认CPU核心数的一半）')
     return parser.parse_args()
 
+# Windows文件名中不合法的字符，translate一次性删除
+_INVALID_FILENAME_CHARS = str.maketrans('', '', '<>:"/\\|?*')
+
+# 各输出目录当前已分配到的最大序号缓存，目录只在首次访问时扫描一次
+_seq_cache = {}
+
 def get_next_sequence_number(base_dir: str) -> str:
     """
-    获取下一个可用的序列号目录
-    
+    获取下一个可用的序列号并原子认领对应目录
+
+    首次访问某个目录时用os.scandir单次扫描出最大序号（DirEntry自带
+    类型信息，不必逐项stat），之后在进程内直接递增计数器。
+    单纯内存里max+1在多进程并行时会把同一个序号发给两个工作进程，
+    所以每个候选序号都要用makedirs(exist_ok=False)在文件系统上占坑：
+    目录已被别的进程（或另一个在跑的实例）抢走就递增重试。
+    返回时序号目录已经创建完成。
+
     Args:
         base_dir (str): 基础目录路径
-        
+
     Returns:
-        str: 下一个可用的4位序列号（如：'0001'）
+        str: 认领到的4位序列号（如：'0001'），对应目录已创建
     """
-    if not os.path.exists(base_dir):
-        return "0001"
-        
-    # 获取所有4位数字命名的目录
-    existing_dirs = [d for d in os.listdir(base_dir) 
-                    if os.path.isdir(os.path.join(base_dir, d)) and 
-                    d.isdigit() and len(d) == 4]
-    
-    if not existing_dirs:
-        return "0001"
-    
-    # 找到最大的序号并加1
-    max_num = max(int(d) for d in existing_dirs)
-    return f"{max_num + 1:04d}"
+    if base_dir not in _seq_cache:
+        max_num = 0
+        if os.path.exists(base_dir):
+            with os.scandir(base_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir() and len(entry.name) == 4 and entry.name.isdigit():
+                        num = int(entry.name)
+                        if num > max_num:
+                            max_num = num
+        _seq_cache[base_dir] = max_num
+
+    while True:
+        _seq_cache[base_dir] += 1
+        sequence_number = f"{_seq_cache[base_dir]:04d}"
+        try:
+            os.makedirs(os.path.join(base_dir, sequence_number))
+            return sequence_number
+        except FileExistsError:
+            # 序号已被并发进程占用，继续向后找
+            continue
 
 def process_single_video(pip1_folder, pip2_folder, outputs_folder, temp_dir, background_type, excel_path):
     """处理单个视频的函数"""
     start_time = time.time()
+
+    # 兼容直接传入数字参数的调用方（1=虚化 2=纯黑），统一成字符串，
+    # 避免后面 background_type == 'blur' 的分支判断被整数悄悄短路
+    if background_type in (1, 2):
+        background_type = 'blur' if background_type == 1 else 'black'
     
     # 1. 随机选择主视频和对应的Excel文件
     console.print("\n[bold cyan]1. 选择主视频和Excel文件")
@@ -149,10 +160,9 @@ def process_single_video(pip1_folder, pip2_folder, outputs_folder, temp_dir, bac
     output_subfolder = os.path.join(outputs_folder, video_name)
     os.makedirs(output_subfolder, exist_ok=True)
     
-    # 获取序列号并创建序列号子文件夹
+    # 原子认领序列号（目录由认领动作本身创建）
     sequence_number = get_next_sequence_number(output_subfolder)
     sequence_subfolder = os.path.join(output_subfolder, sequence_number)
-    os.makedirs(sequence_subfolder, exist_ok=True)
     console.print(f"[green]创建输出子文件夹: {sequence_subfolder}")
     
     # 读取Excel文件中的文字内容
@@ -162,12 +172,10 @@ def process_single_video(pip1_folder, pip2_folder, outputs_folder, temp_dir, bac
     console.print(f"[bold cyan]顶部副标题：{title2}")
     console.print(f"[bold cyan]底部文字：{bottom_text}")
     
-    # 使用三个标题组合作为文件名（去除不合法的文件名字符）
-    invalid_chars = '<>:"/\\|?*'
-    filename = f"{title1}{title2}{bottom_text}"
-    for char in invalid_chars:
-        filename = filename.replace(char, '')
-    
+    # 使用三个标题组合作为文件名（单次translate去除不合法字符，
+    # 不必每个字符replace整串扫一遍）
+    filename = f"{title1}{title2}{bottom_text}".translate(_INVALID_FILENAME_CHARS)
+
     # 确保文件名不会重复添加.mp4扩展名
     if not filename.endswith('.mp4'):
         filename = f"{filename}.mp4"
@@ -191,37 +199,73 @@ def process_single_video(pip1_folder, pip2_folder, outputs_folder, temp_dir, bac
     side_video_x = main_width
     # 计算左侧视频缩放后的高度（减去上下裁剪）
     main_height = int(height * main_video_scale) - 100  # 减去上下各50像素的裁剪
-    
-    # 2. 创建背景视频（根据用户选择创建模糊或纯黑背景）
-    console.print(f"\n[bold cyan]2. 创建{background_type}背景视频")
+
+    # 可选：单次ffmpeg融合流水线，所有步骤在一张滤镜图内完成，不写中间文件
+    if VIDEO_SETTINGS.get('FUSED_PIPELINE'):
+        console.print("\n[bold cyan]2. 融合流水线：单次ffmpeg完成全部合成")
+        sequence = process_pip2_videos(main_video_path, pip2_folder)
+        text_overlay = create_text_overlay(title1, title2, bottom_text, width, height)
+        tv_overlay_path = os.path.join("assets", "tv.png")
+        run_fused_pipeline(
+            main_video_path, sequence, os.path.abspath(output_path),
+            background_type=background_type,
+            overlay_image=tv_overlay_path if os.path.exists(tv_overlay_path) else None,
+            text_overlay=text_overlay,
+            main_x=main_video_x
+        )
+        video_duration = get_video_duration(output_path)
+        print_summary(output_path, start_time, video_duration)
+        return video_name
+
+    # 2-5. 背景、主视频、各侧视频之间没有数据依赖，
+    # 并行提交各自的ffmpeg任务（等待都在子进程里，不受GIL影响）
+    console.print(f"\n[bold cyan]2. 并行创建{background_type}背景/主视频/侧视频序列")
     blurred_bg = os.path.join(temp_dir, "background.mp4")
-    if background_type == 'blur':
-        create_blurred_background(main_video_path, blurred_bg, blur_sigma)
-    else:  # black
-        create_black_background(main_video_path, blurred_bg)
-    
-    # 3. 创建左侧主视频（缩放并保持音频）
-    console.print("\n[bold cyan]3. 创建左侧主视频")
     resized_main = os.path.join(temp_dir, "main.mp4")
-    create_main_video(main_video_path, resized_main, scale=main_video_scale)
-    
-    # 4. 获取视频总时长
-    console.print("\n[bold cyan]4. 获取视频时长")
-    total_duration = get_video_duration(blurred_bg)
-    
-    # 5. 创建右侧视频序列
-    console.print("\n[bold cyan]5. 创建右侧视频序列")
-    side_videos = []
     sequence = process_pip2_videos(main_video_path, pip2_folder)
-    
-    # 处理所有选中的视频
+
+    # 序列中重复出现的素材只编码一次，重复项直接复用同一个输出文件
+    # （合并时同一文件作为多个输入没有问题）
+    encoded = {}
+    side_videos = []
+    side_jobs = []
     for i, video_path in enumerate(sequence):
-        output_path_side = os.path.join(temp_dir, f"side_{i}.mp4")
-        create_side_video(video_path, output_path_side, target_height=main_height)  # 传递目标高度
-        side_videos.append(output_path_side)
-    
-    # 6. 合并所有视频
-    console.print("\n[bold cyan]6. 合并所有视频")
+        if video_path in encoded:
+            side_videos.append(encoded[video_path])
+        else:
+            side_output = os.path.join(temp_dir, f"side_{i}.mp4")
+            encoded[video_path] = side_output
+            side_videos.append(side_output)
+            side_jobs.append((video_path, side_output))
+
+    with ThreadPoolExecutor(max_workers=min(8, len(side_jobs) + 2)) as executor:
+        if background_type == 'blur':
+            f_bg = executor.submit(create_blurred_background, main_video_path, blurred_bg, blur_sigma)
+        else:  # black
+            f_bg = executor.submit(create_black_background, main_video_path, blurred_bg)
+        f_main = executor.submit(create_main_video, main_video_path, resized_main, scale=main_video_scale)
+        side_futures = [executor.submit(create_side_video, video_path, side_output, target_height=main_height)
+                        for video_path, side_output in side_jobs]
+        # 文字叠加图的PIL渲染与ffmpeg编码重叠执行，
+        # 合并阶段调用create_text_overlay时直接命中缓存
+        f_text = executor.submit(create_text_overlay, title1, title2, bottom_text, width, height)
+        # 等待全部完成，任一任务失败则在此抛出异常
+        for future in [f_bg, f_main, f_text] + side_futures:
+            future.result()
+
+    # 获取视频总时长（背景由主视频生成，时长一致，直接复用主视频的缓存探测结果）
+    total_duration = get_video_duration(main_video_path)
+
+    # 6. 合并所有视频（图片叠加融合在同一次ffmpeg调用里，
+    # 不再把输出重命名后整片再编码一遍）
+    console.print("\n[bold cyan]6. 合并所有视频（含图片叠加）")
+    tv_overlay_path = os.path.join("assets", "tv.png")
+    if os.path.exists(tv_overlay_path):
+        console.print("[green]电视机边框效果将在合并时叠加")
+    else:
+        tv_overlay_path = None
+        console.print("[yellow]警告: 未找到tv.png文件，跳过图片叠加步骤")
+
     combine_videos(
         blurred_bg, resized_main, side_videos, os.path.abspath(output_path),
         main_x=main_video_x,
@@ -229,24 +273,10 @@ def process_single_video(pip1_folder, pip2_folder, outputs_folder, temp_dir, bac
         title1=title1,
         title2=title2,
         bottom_text=bottom_text,
-        add_subtitles=True
+        add_subtitles=True,
+        overlay_png=tv_overlay_path
     )
-    
-    # 7. 添加图片叠加
-    console.print("\n[bold cyan]7. 添加图片叠加")
-    tv_overlay_path = os.path.join("assets", "tv.png")
-    if os.path.exists(tv_overlay_path):
-        temp_output = os.path.join(temp_dir, "temp_output.mp4")
-        # 将当前输出文件移动到临时文件
-        os.rename(output_path, temp_output)
-        # 添加图片叠加
-        add_image_overlay(temp_output, tv_overlay_path, output_path)
-        # 删除临时文件
-        os.remove(temp_output)
-        console.print("[green]成功添加电视机边框效果")
-    else:
-        console.print("[yellow]警告: 未找到tv.png文件，跳过图片叠加步骤")
-    
+
     # 获取视频时长
     video_duration = get_video_duration(output_path)
     
@@ -256,6 +286,59 @@ def process_single_video(pip1_folder, pip2_folder, outputs_folder, temp_dir, bac
     # 返回视频名称
     return video_name
 
+def iter_mp4s(root):
+    """递归遍历目录下的mp4文件
+
+    使用os.scandir流式生成路径（dirent自带类型信息，省去逐项stat），
+    不像glob那样在开始处理前物化整个列表。
+
+    Args:
+        root (str): 根目录路径
+    Yields:
+        str: mp4文件路径
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_mp4s(entry.path)
+            elif entry.name.endswith('.mp4'):
+                yield entry.path
+
+# 当前工作进程的临时子目录，由进程池initializer创建一次后重复使用
+_worker_temp = None
+
+def _init_worker(temp_dir, pip1_folder=None):
+    """进程池initializer：为工作进程创建一次性的专属临时子目录
+
+    目录在进程生命周期内反复复用（中间文件直接被下一个视频覆盖），
+    避免每个视频都mkdir/rmtree一遍；进程退出时由atexit整体删除。
+    同时并行预热主视频的探测缓存，后续每个视频的尺寸查询直接命中，
+    不在处理关键路径上同步等探测。
+
+    Args:
+        temp_dir (str): 临时目录根路径
+        pip1_folder (str): 主视频目录，提供时预热其下所有mp4的探测缓存
+    """
+    global _worker_temp
+    _worker_temp = os.path.join(temp_dir, f"w{os.getpid()}")
+    os.makedirs(_worker_temp, exist_ok=True)
+    atexit.register(shutil.rmtree, _worker_temp, ignore_errors=True)
+    if pip1_folder:
+        warm_probe_cache(iter_mp4s(pip1_folder))
+
+def process_video_job(job):
+    """进程池工作函数：在本进程专属的临时子目录中处理一个视频
+
+    Args:
+        job (dict): 处理参数（路径、背景类型等），保证可pickle
+    Returns:
+        str: 处理的视频名称
+    """
+    return process_single_video(
+        job['pip1_folder'], job['pip2_folder'], job['outputs_folder'],
+        _worker_temp, job['background_type'], job['excel_path']
+    )
+
 def main(get_name_only=False):
     """主函数
     Args:
@@ -296,28 +379,42 @@ def main(get_name_only=False):
             # 自动处理所有视频
             if not get_name_only:
                 console.print("\n[bold cyan]=== 自动处理模式 ===")
-            video_files = glob.glob(os.path.join(pip1_folder, "**/*.mp4"), recursive=True)
-            total_videos = len(video_files)
-            if not get_name_only:
-                console.print(f"[bold cyan]找到 {total_videos} 个视频文件需要处理")
-            
-            for i, video_file in enumerate(video_files, 1):
-                if not get_name_only:
-                    console.print(f"\n[bold cyan]正在处理第 {i}/{total_videos} 个视频: {os.path.basename(video_file)}")
+            if get_name_only:
+                # 只需要获取一个视频名称，顺序处理一个即可
                 try:
                     video_name = process_single_video(pip1_folder, pip2_folder, outputs_folder, temp_dir, background_type, args.excel)
-                    if get_name_only:
-                        break  # 只需要获取一个视频名称
-                    else:
-                        # 每处理完一个视频就清理一次
-                        cleanup_resources()
+                except Exception:
+                    pass
+            else:
+                # 每个视频是独立的ffmpeg流水线，用有界进程池并行处理
+                job = {
+                    'pip1_folder': pip1_folder,
+                    'pip2_folder': pip2_folder,
+                    'outputs_folder': outputs_folder,
+                    'background_type': background_type,
+                    'excel_path': args.excel,
+                }
+                max_workers = max(1, args.max_workers)
+                console.print(f"[bold cyan]并行进程数: {max_workers}")
+                try:
+                    with ProcessPoolExecutor(max_workers=max_workers,
+                                             initializer=_init_worker,
+                                             initargs=(temp_dir, pip1_folder)) as executor:
+                        # 流式发现视频并提交任务，目录遍历与处理重叠进行
+                        futures = [executor.submit(process_video_job, job)
+                                   for _ in iter_mp4s(pip1_folder)]
+                        total_videos = len(futures)
+                        console.print(f"[bold cyan]找到 {total_videos} 个视频文件需要处理")
+                        for i, future in enumerate(as_completed(futures), 1):
+                            try:
+                                video_name = future.result()
+                                console.print(f"\n[bold cyan]已完成第 {i}/{total_videos} 个视频: {video_name}")
+                            except Exception as e:
+                                console.print(f"[red]处理视频时出错: {str(e)}")
                 except KeyboardInterrupt:
-                    if not get_name_only:
-                        console.print("\n[bold red]用户中断处理")
-                    break
-                except Exception as e:
-                    if not get_name_only:
-                        console.print(f"[red]处理视频时出错: {str(e)}")
+                    console.print("\n[bold red]用户中断处理")
+                # 批量处理结束后统一清理临时目录
+                cleanup_resources()
         else:
             # 处理单个视频
             if get_name_only:
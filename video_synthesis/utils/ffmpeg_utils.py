@@ -1,9 +1,45 @@
 """
 FFmpeg工具函数模块
 """
+import os
+import json
 import subprocess
-from queue import Queue, Empty
+from functools import lru_cache
+from queue import Queue
 from threading import Thread
+from video_synthesis.config.settings import VIDEO_SETTINGS
+
+try:
+    # PyAV在进程内复用libav*，探测元数据无需fork子进程
+    import av as _av
+except ImportError:
+    _av = None
+
+def apply_thread_flags(cmd):
+    """为ffmpeg命令注入线程参数
+
+    统一附加 -threads / -filter_threads / -filter_complex_threads，
+    0表示让ffmpeg自动使用全部核心。并行批量处理时可在配置中调小，
+    避免 进程数 × 线程数 超过核心数导致超订。
+    -threads要注入两处：放在首个-i前只作用于第一路输入的解码器，
+    真正吃线程的编码器必须靠输出位置（输出文件前）的那份来限制；
+    两个filter线程参数是全局选项，放在开头即可。
+
+    Args:
+        cmd (list): ffmpeg命令列表
+    Returns:
+        list: 注入线程参数后的命令列表
+    """
+    if not cmd or os.path.basename(cmd[0]) not in ('ffmpeg', 'ffmpeg.exe'):
+        return cmd
+    threads = str(VIDEO_SETTINGS.get('FFMPEG_THREADS', 0))
+    return (cmd[:1] + ['-threads', threads,
+                       '-filter_threads', threads,
+                       '-filter_complex_threads', threads]
+            + cmd[1:-1] + ['-threads', threads, cmd[-1]])
+
+# Windows下避免为每个子进程分配控制台窗口；其他平台无此标志
+_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
 
 def run_ffmpeg_command(cmd, description="处理中"):
     """运行ffmpeg命令
@@ -11,32 +47,36 @@ def run_ffmpeg_command(cmd, description="处理中"):
         cmd (list): ffmpeg命令列表
         description (str): 处理描述
     """
+    cmd = apply_thread_flags(cmd)
     print(f"\n{description}...")
     print("执行命令:", ' '.join(cmd))
-    
-    # 创建进程
+
+    # 创建进程（参数始终以列表形式传递，不经过shell）。
+    # 管道保持二进制+64KB缓冲：ffmpeg的frame=进度刷屏量很大，
+    # 跳过文本IO层的逐行增量解码，只在消费侧按需decode
     process = subprocess.Popen(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        encoding='utf-8',  # 使用UTF-8编码
-        errors='replace'   # 处理无法解码的字符
+        bufsize=1 << 16,
+        creationflags=_NO_WINDOW
     )
-    
+
     # 创建队列存储输出
     output_queue = Queue()
     error_output = []
-    
-    # 定义输出处理函数
+
+    # 定义输出处理函数（EOF时放入None哨兵，消费侧据此确定性退出）
     def enqueue_output(out, queue):
         try:
-            for line in iter(out.readline, ''):
+            for line in iter(out.readline, b''):
                 queue.put(line)
         except Exception as e:
             print(f"读取输出时出错: {str(e)}")
         finally:
             out.close()
-    
+            queue.put(None)
+
     # 创建线程处理输出
     stdout_thread = Thread(target=enqueue_output, args=(process.stdout, output_queue))
     stderr_thread = Thread(target=enqueue_output, args=(process.stderr, output_queue))
@@ -44,33 +84,31 @@ def run_ffmpeg_command(cmd, description="处理中"):
     stderr_thread.daemon = True
     stdout_thread.start()
     stderr_thread.start()
-    
-    # 实时处理输出
-    while True:
+
+    # 实时处理输出：阻塞式get让内核唤醒消费线程，
+    # 不再用get_nowait+continue空转烧掉整核CPU
+    finished_streams = 0
+    while finished_streams < 2:
         try:
-            # 检查进程是否结束
-            if process.poll() is not None and output_queue.empty():
-                break
-            
-            try:
-                line = output_queue.get_nowait()
-            except Empty:
+            raw = output_queue.get()
+            if raw is None:
+                # 一路输出流已到EOF
+                finished_streams += 1
                 continue
-            
-            # 处理输出
+
+            # 处理输出（此处才解码，读取线程只搬运字节）
+            line = raw.decode('utf-8', errors='replace').strip()
             if line.startswith("frame="):
-                print(line.strip(), end='\r')
+                print(line, end='\r')
             else:
-                print(line.strip())
-                error_output.append(line.strip())
-                
+                print(line)
+                error_output.append(line)
+
         except Exception as e:
             print(f"处理输出时出错: {str(e)}")
             break
-    
-    # 等待进程结束
-    process.stdout.close()
-    process.stderr.close()
+
+    # 等待进程结束（两路输出已关闭，这里不会再阻塞在管道上）
     process.wait()
     
     if process.returncode != 0:
@@ -81,22 +119,112 @@ def run_ffmpeg_command(cmd, description="处理中"):
     
     print(f"{description}完成")
 
-def get_video_duration(video_path):
-    """获取视频时长
+@lru_cache(maxsize=256)
+def _probe(video_path, mtime_ns, size):
+    """一次ffprobe同时取出尺寸和时长，结果按(路径, mtime, 大小)缓存
+
+    同一个文件反复查询只fork一次ffprobe；文件被重写后
+    mtime/大小变化会自动使旧缓存失效。
+    安装了PyAV时直接在进程内打开容器读取元数据，完全不产生子进程，
+    省去每次fork+动态库加载的固定开销；否则回退到ffprobe。
+
     Args:
         video_path (str): 视频文件路径
+        mtime_ns (int): 文件修改时间（纳秒，参与缓存键）
+        size (int): 文件大小（字节，参与缓存键）
     Returns:
-        float: 视频时长（秒）
+        tuple: (width, height, duration)
     """
+    if _av is not None:
+        with _av.open(video_path) as container:
+            stream = container.streams.video[0]
+            duration = float(container.duration) / _av.time_base
+            return stream.width, stream.height, duration
     cmd = [
-        'ffprobe', 
+        'ffprobe',
         '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height',
         '-show_entries', 'format=duration',
-        '-of', 'default=noprint_wrappers=1:nokey=1',
+        '-of', 'json',
         video_path
     ]
-    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    duration = float(result.stdout.strip())
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    info = json.loads(result.stdout)
+    stream = info['streams'][0]
+    duration = float(info['format']['duration'])
+    return int(stream['width']), int(stream['height']), duration
+
+def _probe_cached(video_path):
+    """以当前文件状态为键查询探测缓存"""
+    stat = os.stat(video_path)
+    return _probe(video_path, stat.st_mtime_ns, stat.st_size)
+
+@lru_cache(maxsize=1)
+def get_h264_encoder_args():
+    """选择最终合成用的H.264编码器参数
+
+    按配置HW_ACCEL（'auto'/'cuda'/None）探测一次ffmpeg可用编码器：
+    有NVENC时用GPU编码（p4预设，速度/质量均衡），把CPU让给并行的
+    其他视频任务；否则回退到libx264。结果缓存，整个进程只探测一次。
+
+    Returns:
+        tuple: 编码器参数（如 ('-c:v', 'h264_nvenc', '-preset', 'p4')）
+    """
+    mode = VIDEO_SETTINGS.get('HW_ACCEL', 'auto')
+    if mode in ('auto', 'cuda'):
+        try:
+            result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                    capture_output=True, text=True)
+            if 'h264_nvenc' in result.stdout:
+                return ('-c:v', 'h264_nvenc', '-preset', 'p4')
+        except Exception:
+            pass
+    return ('-c:v', 'libx264',
+            '-preset', VIDEO_SETTINGS.get('X264_PRESET', 'ultrafast'))
+
+def warm_probe_cache(video_paths):
+    """并行预热探测缓存
+
+    ffprobe调用是I/O密集型，可以放心用线程池并发；批量处理开始时
+    一次性把所有输入探测完，后续每个视频的尺寸/时长查询都命中缓存，
+    不再在关键路径上同步等待探测。
+
+    Args:
+        video_paths (iterable): 视频文件路径集合
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for future in [executor.submit(_probe_cached, p) for p in video_paths]:
+            try:
+                future.result()
+            except Exception:
+                # 个别文件探测失败不影响预热，真正使用时再报错
+                pass
+
+def probe_video(video_path):
+    """一次探测同时取回时长和尺寸
+
+    需要多项元数据的调用方用这个接口，单次ffprobe（或PyAV打开）
+    全部拿到，不必分别调用get_video_duration/get_video_dimensions。
+    结果与两个单项接口共享同一份缓存。
+
+    Args:
+        video_path (str): 视频文件路径
+    Returns:
+        tuple: (duration, width, height)
+    """
+    width, height, duration = _probe_cached(video_path)
+    return duration, width, height
+
+def get_video_duration(video_path):
+    """获取视频时长
+    Args:
+        video_path (str): 视频文件路径
+    Returns:
+        float: 视频时长（秒）
+    """
+    duration = _probe_cached(video_path)[2]
     print(f"视频时长: {duration:.2f}秒")
     return duration
 
@@ -107,14 +235,5 @@ def get_video_dimensions(video_path):
     Returns:
         tuple: (width, height)
     """
-    cmd = [
-        'ffprobe',
-        '-v', 'error',
-        '-select_streams', 'v:0',
-        '-show_entries', 'stream=width,height',
-        '-of', 'csv=s=x:p=0',
-        video_path
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    width, height = map(int, result.stdout.strip().split('x'))
+    width, height, _ = _probe_cached(video_path)
     return width, height 
\ No newline at end of file
@@ -2,10 +2,19 @@
 文件操作工具函数模块
 """
 import os
+import csv
 import glob
 import random
-import pandas as pd
+import shutil
+import time
 import json
+from contextlib import contextmanager
+
+try:
+    # Rust实现的JSON库，解析/序列化比标准库快数倍；未安装时回退标准库
+    import orjson
+except ImportError:
+    orjson = None
 
 def load_history():
     """加载历史记录
@@ -15,14 +24,20 @@ def load_history():
     history_file = "logs/video_history.json"
     if os.path.exists(history_file):
         try:
-            with open(history_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(history_file, 'rb') as f:
+                raw = f.read()
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
         except:
             return {"folders": [], "videos": [], "texts": [], "side_videos": []}
     return {"folders": [], "videos": [], "texts": [], "side_videos": []}
 
 def save_history(history):
     """保存历史记录
+
+    调用方在_history_lock内完成 读取→选择→写回，此处直接整写即可：
+    锁保证不会覆盖别的进程刚写的记录，也保留"重置某项历史"的语义
+    （合并写回会把刚清空的键从盘上又并回来）。写入走临时文件+
+    os.replace原子替换，写一半被杀不会留下截断的JSON。
     Args:
         history (dict): 历史记录数据
     """
@@ -30,19 +45,70 @@ def save_history(history):
     # 只保留最近10次的记录
     for key in history:
         history[key] = history[key][-10:]
-    with open(history_file, 'w', encoding='utf-8') as f:
-        json.dump(history, f, ensure_ascii=False, indent=2)
+    tmp_file = f"{history_file}.tmp"
+    if orjson is not None:
+        # orjson输出UTF-8字节且默认不转义非ASCII，与ensure_ascii=False等价
+        buf = orjson.dumps(history, option=orjson.OPT_INDENT_2)
+    else:
+        buf = json.dumps(history, ensure_ascii=False, indent=2).encode('utf-8')
+    with open(tmp_file, 'wb') as f:
+        f.write(buf)
+    os.replace(tmp_file, history_file)
+
+# 历史记录锁文件：O_CREAT|O_EXCL在Windows/Linux上都是原子操作
+_HISTORY_LOCK_FILE = "logs/video_history.lock"
+
+@contextmanager
+def _history_lock(timeout=10.0):
+    """跨进程串行化历史记录的 读取→选择→写回 窗口
+
+    没有锁时两个并行工作进程可能同时读到同一份历史、抽中同一个
+    视频/文字组合；持锁后后来者能看到先到者刚写回的记录。
+    等待超过timeout秒视持有进程已异常退出，清掉陈旧锁文件再抢。
+    """
+    os.makedirs(os.path.dirname(_HISTORY_LOCK_FILE), exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(_HISTORY_LOCK_FILE,
+                         os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            if time.monotonic() >= deadline:
+                try:
+                    os.remove(_HISTORY_LOCK_FILE)
+                except OSError:
+                    pass
+                deadline = time.monotonic() + timeout
+            else:
+                time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        try:
+            os.remove(_HISTORY_LOCK_FILE)
+        except OSError:
+            pass
 
 def get_random_video(folder_path, exclude_video=None):
     """从指定文件夹中随机选择一个视频（包括子文件夹）
+
+    整个 读取历史→选择→写回 窗口持有跨进程锁，
+    并行工作进程不会抽中同一个视频。
     Args:
         folder_path (str): 视频文件夹路径
         exclude_video (str): 要排除的视频文件名（避免重复）
     Returns:
         tuple: (视频路径, CSV文件路径)
     """
+    with _history_lock():
+        return _select_random_video(folder_path, exclude_video)
+
+def _select_random_video(folder_path, exclude_video):
+    """get_random_video的主体，调用方需已持有历史记录锁"""
     history = load_history()
-    
+
     folder_path = os.path.normpath(folder_path)
     if not os.path.exists(folder_path):
         raise Exception(f"文件夹不存在: {folder_path}")
@@ -53,8 +119,9 @@ def get_random_video(folder_path, exclude_video=None):
     if not subdirs:
         raise Exception(f"在 {folder_path} 中没有找到子文件夹")
     
-    # 排除最近使用过的文件夹
-    available_dirs = [d for d in subdirs if os.path.basename(d) not in history['folders']]
+    # 排除最近使用过的文件夹（构造一次set，避免逐项线性查找）
+    folders_seen = set(history['folders'])
+    available_dirs = [d for d in subdirs if os.path.basename(d) not in folders_seen]
     if not available_dirs:
         print("警告：所有文件夹都已使用过，重置历史记录")
         available_dirs = subdirs
@@ -81,8 +148,9 @@ def get_random_video(folder_path, exclude_video=None):
     if exclude_video:
         videos = [v for v in videos if os.path.basename(v) != exclude_video]
     
-    # 排除最近使用过的视频
-    available_videos = [v for v in videos if os.path.basename(v) not in history['videos']]
+    # 排除最近使用过的视频（构造一次set，避免逐项线性查找）
+    videos_seen = set(history['videos'])
+    available_videos = [v for v in videos if os.path.basename(v) not in videos_seen]
     if not available_videos:
         print("警告：当前文件夹中所有视频都已使用过，重置该文件夹的历史记录")
         available_videos = videos
@@ -95,87 +163,146 @@ def get_random_video(folder_path, exclude_video=None):
     if not os.path.isfile(selected):
         raise Exception(f"选中的视频文件不存在: {selected}")
     
-    # 更新历史记录
+    # 更新历史记录：每次选择后立即合并写回，
+    # 进程异常退出不丢记录，并行工作进程间也能互相看到
     history['folders'].append(os.path.basename(selected_dir))
     history['videos'].append(os.path.basename(selected))
     save_history(history)
-    
+
     return selected, csv_path
 
+# 已解析CSV缓存：路径 -> (mtime, 行列表)，同一文件批量处理只解析一次
+_text_rows_cache = {}
+
+def _load_text_rows(excel_path):
+    """读取并缓存文字CSV
+
+    只有几十行三列的小表，标准库csv足以胜任，省去仅为此导入
+    pandas+NumPy的数百毫秒启动开销。按(路径, mtime)缓存行列表，
+    文件被编辑后自动重读。
+
+    Args:
+        excel_path (str): CSV文件路径
+    Returns:
+        list: 每行一个dict（列名 -> 值）
+    """
+    mtime = os.path.getmtime(excel_path)
+    cached = _text_rows_cache.get(excel_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    print(f"\n正在读取CSV文件: {excel_path}")
+    with open(excel_path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    _text_rows_cache[excel_path] = (mtime, rows)
+    return rows
+
 def read_text_from_excel(excel_path):
     """从CSV文件中读取文字内容
+
+    选择窗口与get_random_video共用同一把跨进程锁，
+    并行工作进程不会选到同一组文字。
     Args:
         excel_path (str): CSV文件路径
     Returns:
         tuple: (顶部主标题, 顶部副标题, 底部文字)
     """
     try:
-        history = load_history()
-        
-        if not excel_path:
-            print("\n未找到CSV文件，使用默认文字")
-            return ("默认主标题", "默认副标题", "默认底部文字")
-        
-        if not os.path.exists(excel_path):
-            raise FileNotFoundError(f"找不到CSV文件: {excel_path}")
-        
-        print(f"\n正在读取CSV文件: {excel_path}")
-        df = pd.read_csv(excel_path)
-        
-        # 验证列名是否正确
-        required_columns = ['主标题', '副标题', '底部文字']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise ValueError(f"CSV文件缺少必需的列: {missing_columns}")
-        
-        # 生成所有可能的文字组合
-        text_combinations = []
-        for i in range(len(df)):
-            combo = (
-                str(df.iloc[i]['主标题']).strip(),
-                str(df.iloc[i]['副标题']).strip(),
-                str(df.iloc[i]['底部文字']).strip()
-            )
-            text_key = '|'.join(combo)
-            if text_key not in history['texts']:
-                text_combinations.append(combo)
-        
-        if not text_combinations:
-            print("警告：所有文字组合都已使用过，重置历史记录")
-            text_combinations = [(
-                str(df.iloc[i]['主标题']).strip(),
-                str(df.iloc[i]['副标题']).strip(),
-                str(df.iloc[i]['底部文字']).strip()
-            ) for i in range(len(df))]
-            history['texts'] = []
-        
-        # 随机选择一个未使用过的组合
-        selected_combo = random.choice(text_combinations)
-        title1, title2, bottom_text = selected_combo
-        
-        # 检查是否有空值，使用默认值替代
-        if not title1:
-            title1 = "默认主标题"
-        if not title2:
-            title2 = "默认副标题"
-        if not bottom_text:
-            bottom_text = "默认底部文字"
-        
-        print("\n从CSV中读取的文字内容：")
-        print(f"顶部主标题：{title1}")
-        print(f"顶部副标题：{title2}")
-        print(f"底部文字：{bottom_text}")
-        
-        # 更新历史记录
-        history['texts'].append('|'.join(selected_combo))
-        save_history(history)
-        
-        return (title1, title2, bottom_text)
+        with _history_lock():
+            return _select_text_combination(excel_path)
     except Exception as e:
         print(f"读取CSV文件失败: {str(e)}")
         print("将使用默认文字")
         return ("默认主标题", "默认副标题", "默认底部文字")
 
+def _select_text_combination(excel_path):
+    """read_text_from_excel的主体，调用方需已持有历史记录锁"""
+    history = load_history()
+
+    if not excel_path:
+        print("\n未找到CSV文件，使用默认文字")
+        return ("默认主标题", "默认副标题", "默认底部文字")
+
+    if not os.path.exists(excel_path):
+        raise FileNotFoundError(f"找不到CSV文件: {excel_path}")
+
+    rows = _load_text_rows(excel_path)
+
+    # 验证列名是否正确
+    required_columns = ['主标题', '副标题', '底部文字']
+    fieldnames = rows[0].keys() if rows else ()
+    missing_columns = [col for col in required_columns if col not in fieldnames]
+    if missing_columns:
+        raise ValueError(f"CSV文件缺少必需的列: {missing_columns}")
+
+    # 生成所有可能的文字组合
+    all_combinations = [(
+        str(row['主标题']).strip(),
+        str(row['副标题']).strip(),
+        str(row['底部文字']).strip()
+    ) for row in rows]
+    texts_seen = set(history['texts'])
+    text_combinations = [combo for combo in all_combinations
+                         if '|'.join(combo) not in texts_seen]
+
+    if not text_combinations:
+        print("警告：所有文字组合都已使用过，重置历史记录")
+        text_combinations = all_combinations
+        history['texts'] = []
+    
+    # 随机选择一个未使用过的组合
+    selected_combo = random.choice(text_combinations)
+    title1, title2, bottom_text = selected_combo
+    
+    # 检查是否有空值，使用默认值替代
+    if not title1:
+        title1 = "默认主标题"
+    if not title2:
+        title2 = "默认副标题"
+    if not bottom_text:
+        bottom_text = "默认底部文字"
+    
+    print("\n从CSV中读取的文字内容：")
+    print(f"顶部主标题：{title1}")
+    print(f"顶部副标题：{title2}")
+    print(f"底部文字：{bottom_text}")
+    
+    # 更新历史记录（立即合并写回，见save_history）
+    history['texts'].append('|'.join(selected_combo))
+    save_history(history)
+    
+    return (title1, title2, bottom_text)
+
+def write_bytes_atomic(path, data):
+    """原子写入二进制文件
+
+    64KB缓冲一次写完整个内容再os.replace替换，既避开小批量写入
+    的stdio性能陷阱（Windows上尤其明显），也保证读到的文件
+    永远是完整的。
+    Args:
+        path (str): 目标文件路径
+        data (bytes): 要写入的数据
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb', buffering=1 << 16) as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def count_entries(path):
+    """统计目录下的条目数
+
+    scandir流式遍历，不像listdir那样先物化整个名字列表，
+    目录不存在时返回0。
+    Args:
+        path (str): 目录路径
+    Returns:
+        int: 目录条目数
+    """
+    try:
+        with os.scandir(path) as it:
+            return sum(1 for _ in it)
+    except OSError:
+        return 0
+
 def ensure_directory(directory):
     """确保目录存在，如果不存在则创建
     Args:
@@ -187,12 +314,13 @@ def ensure_directory(directory):
 
 def cleanup_temp_files(temp_dir):
     """清理临时文件和目录
+
+    整树交给shutil.rmtree的C级遍历删除，不再逐文件glob+remove——
+    既省去Python循环开销，也能正确处理嵌套子目录（原实现会在
+    子目录上直接崩溃）。
     Args:
         temp_dir (str): 临时目录路径
     """
     if os.path.exists(temp_dir):
-        for file in glob.glob(os.path.join(temp_dir, "*")):
-            os.remove(file)
-            print(f"删除: {file}")
-        os.rmdir(temp_dir)
-        print(f"删除: {temp_dir} 文件夹") 
\ No newline at end of file
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        print(f"删除: {temp_dir} 文件夹")
\ No newline at end of file
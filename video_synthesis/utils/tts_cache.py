@@ -0,0 +1,53 @@
+"""
+TTS音频磁盘缓存模块
+
+按合成参数的SHA-256指纹缓存已生成的音频，相同文本+音色的
+重复合成直接命中磁盘文件，省去远端API调用和网络往返。
+缓存按哈希前两位分片存放，避免单目录文件过多。
+"""
+import os
+import hashlib
+
+# 缓存根目录（与logs/temp同级，跨次运行共享）
+CACHE_DIR = os.path.join("cache", "tts")
+
+def _cache_path(cache_key):
+    """计算缓存键对应的文件路径
+    Args:
+        cache_key (str): 缓存键（音色|韵律参数|文本 拼接串）
+    Returns:
+        str: 缓存文件路径（两级分片）
+    """
+    digest = hashlib.sha256(cache_key.encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, digest[:2], f"{digest}.mp3")
+
+def lookup(cache_key):
+    """查询缓存
+    Args:
+        cache_key (str): 缓存键
+    Returns:
+        str: 命中时返回缓存文件路径，否则返回None
+    """
+    path = _cache_path(cache_key)
+    try:
+        if os.path.getsize(path) > 0:
+            return path
+    except OSError:
+        pass
+    return None
+
+def store(cache_key, data):
+    """写入缓存（原子替换，写一半被杀不会留下损坏的缓存文件）
+    Args:
+        cache_key (str): 缓存键
+        data (bytes): 音频数据
+    Returns:
+        str: 缓存文件路径
+    """
+    path = _cache_path(cache_key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return path